@@ -254,17 +254,10 @@ class AIMarketAnalyzer:
         if len(prices) < 2:
             return 50.0
         
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
+        # Split each change into gain / loss with max() rather than a data-dependent branch
+        changes = [b - a for a, b in zip(prices, prices[1:])]
+        gains = [max(c, 0) for c in changes]
+        losses = [max(-c, 0) for c in changes]
         
         if not gains or not losses:
             return 50.0
@@ -6,8 +6,10 @@ import logging
 import smtplib
 import json
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
@@ -203,7 +205,7 @@ class AdvancedAlertManager:
         self.notification_service = notification_service
         self.alerts: Dict[str, Alert] = {}
         self.trigger_history: List[AlertTrigger] = []
-        self.price_data: Dict[str, List[Dict]] = {}
+        self.price_data: Dict[str, Deque[Dict]] = {}
         self.portfolio_data: Dict[str, Any] = {}
         self.running = False
         
@@ -247,16 +249,13 @@ class AdvancedAlertManager:
     def update_price_data(self, symbol: str, data: Dict[str, Any]):
         """Update price data for a symbol"""
         if symbol not in self.price_data:
-            self.price_data[symbol] = []
+            # Keep only last 1000 data points; the deque drops the oldest without copying
+            self.price_data[symbol] = deque(maxlen=1000)
         
         self.price_data[symbol].append({
             **data,
             "timestamp": datetime.now().isoformat()
         })
-        
-        # Keep only last 1000 data points
-        if len(self.price_data[symbol]) > 1000:
-            self.price_data[symbol] = self.price_data[symbol][-1000:]
     
     def update_portfolio_data(self, data: Dict[str, Any]):
         """Update portfolio data"""
@@ -321,8 +320,9 @@ class AdvancedAlertManager:
                 volume_threshold = condition.get("volume_multiplier", 2.0)
                 current_volume = latest_data.get("volume", 0)
                 
-                if len(self.price_data[symbol]) >= 20:
-                    avg_volume = sum(d.get("volume", 0) for d in self.price_data[symbol][-20:]) / 20
+                history = self.price_data[symbol]
+                if len(history) >= 20:
+                    avg_volume = sum(d.get("volume", 0) for d in islice(history, len(history) - 20, None)) / 20
                     if current_volume >= (avg_volume * volume_threshold):
                         return True, f"{symbol} volume spike: {current_volume} vs avg {avg_volume:.0f}", {
                             "current_volume": current_volume,
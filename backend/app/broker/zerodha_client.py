@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from kiteconnect import KiteConnect
 
@@ -20,6 +21,7 @@ class ZerodhaClient:
         self.api_key = api_key
         self.api_secret = api_secret
         self._kite = KiteConnect(api_key=api_key)
+        self._order_pool: Optional[ThreadPoolExecutor] = None
         if access_token:
             self._kite.set_access_token(access_token)
 
@@ -57,6 +59,27 @@ class ZerodhaClient:
         )
         return {"order_id": order_id}
 
+    def place_orders_basket(self, orders: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """Place several market orders concurrently, one place_market_order call each.
+
+        ``orders`` holds place_market_order keyword arguments. Results come back
+        in the same order; a failed order yields {"error": ...} instead of raising,
+        so one rejection does not drop the rest of the basket.
+        """
+        def place(order: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return self.place_market_order(**order)
+            except Exception as e:
+                logger.exception("Order placement failed for %s", order.get("tradingsymbol"))
+                return {"error": str(e)}
+
+        if len(orders) <= 1:
+            return [place(o) for o in orders]
+        if self._order_pool is None:
+            # Kite accepts a few orders per second, so a small pool covers a burst of signals
+            self._order_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="basket")
+        return list(self._order_pool.map(place, orders))
+
     def get_ltp(self, instruments: Dict[str, str]) -> Dict[str, Any]:
         try:
             return self._kite.ltp(instruments)
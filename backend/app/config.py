@@ -33,7 +33,7 @@ def get_config() -> Config:
     zerodha_user_id = os.getenv("ZERODHA_USER_ID", "").strip()
     zerodha_totp_secret = os.getenv("ZERODHA_TOTP_SECRET")
     access_token = os.getenv("ACCESS_TOKEN")
-    instruments_csv_path = os.getenv("INSTRUMENTS_CSV_PATH", "data/instruments.csv").strip()
+    instruments_csv_path = os.getenv("INSTRUMENTS_CSV_PATH", "data/instruments.parquet").strip()
     log_level = os.getenv("LOG_LEVEL", "INFO").strip().upper()
     dry_run = os.getenv("DRY_RUN", "true").lower() in {"1", "true", "yes", "y"}
     env = os.getenv("ENV", "dev").strip()
@@ -6,6 +6,8 @@ from typing import Callable, Dict, Iterable, List, Optional
 
 from kiteconnect import KiteTicker
 
+from app.strategies.base import tick_price
+
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,9 @@ class MarketTicker:
 
         def _on_ticks(ws, ticks):
             try:
+                # Normalize the price once here so every consumer reads the single "_px" key
+                for t in ticks:
+                    t["_px"] = tick_price(t)
                 self.on_tick(ticks)
             except Exception:
                 logger.exception("on_tick handler error")
@@ -198,8 +198,9 @@ class AdvancedPortfolioManager:
             
             # Sharpe ratio (simplified)
             if len(self.daily_pnl_history) >= 20:
-                avg_return = sum(self.daily_pnl_history[-20:]) / len(self.daily_pnl_history[-20:])
-                std_return = (sum((r - avg_return) ** 2 for r in self.daily_pnl_history[-20:]) / len(self.daily_pnl_history[-20:])) ** 0.5
+                recent = self.daily_pnl_history[-20:]  # sliced once, not per sum
+                avg_return = sum(recent) / len(recent)
+                std_return = (sum((r - avg_return) ** 2 for r in recent) / len(recent)) ** 0.5
                 sharpe_ratio = avg_return / std_return if std_return > 0 else 0
             else:
                 sharpe_ratio = 0
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
 import asyncio
-import csv
 import logging
+import sys
+import threading
 import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime, time as dtime, timezone, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from app.config import get_config
 from app.logging_setup import setup_logging
 from app.broker.zerodha_client import ZerodhaClient
 from app.market.ticker import MarketTicker
-from app.strategies.base import BaseStrategy
+from app.strategies.base import BaseStrategy, Signal
 from app.strategies.sma_crossover import SmaCrossoverStrategy
 from app.strategies.ema_crossover import EmaCrossoverStrategy
 from app.strategies.rsi_strategy import RsiStrategy
@@ -33,12 +40,13 @@ from app.ai.trading_engine import AITradingEngine
 from app.risk.portfolio_manager import AdvancedPortfolioManager, RiskLevel
 from app.alerts.notification_system import AdvancedAlertManager, Alert, AlertType, AlertPriority, NotificationChannel, NotificationService
 from app.backtesting.engine import BacktestEngine, OrderSide, OrderType
-from app.utils.symbols import load_instruments, resolve_tokens_by_symbols, search_symbols
+from app.server.order_store import OrderLog, OrderStore
+from app.utils.symbols import build_symbol_index, load_instruments, resolve_tokens_by_symbols, search_symbols, write_instruments
 
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Zerodha Auto Trader API")
+app = FastAPI(title="Zerodha Auto Trader API", default_response_class=ORJSONResponse)
 
 # CORS for frontend (Vercel)
 import os
@@ -116,6 +124,14 @@ def _initialize_auth_cache():
 _initialize_auth_cache()
 
 
+def _write_instruments(data: list) -> str:
+    """Persist a broker instrument dump to cfg.instruments_csv_path (Parquet or CSV by extension)."""
+    path = Path(cfg.instruments_csv_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_instruments(data, str(path))
+    return str(path)
+
+
 def _load_or_download_instruments() -> list:
     csv_path = Path(cfg.instruments_csv_path)
     # In demo mode (Render/GitHub with demo_key), avoid download attempts and use in-memory demo instruments
@@ -126,19 +142,15 @@ def _load_or_download_instruments() -> list:
     try:
         return load_instruments(str(csv_path))
     except FileNotFoundError:
-        logger.warning("Instruments CSV missing at %s. Attempting to download...", csv_path)
+        logger.warning("Instruments file missing at %s. Attempting to download...", csv_path)
         try:
             data = broker.instruments()
             if not data:
                 logger.warning("Broker returned no instruments. Falling back to demo instruments in-memory.")
                 return _create_demo_instruments()
-            csv_path.parent.mkdir(parents=True, exist_ok=True)
-            with csv_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
+            path = _write_instruments(data)
             logger.info("Instruments downloaded: %s entries", len(data))
-            return load_instruments(str(csv_path))
+            return load_instruments(path)
         except Exception as e:
             # Avoid noisy traceback in managed environments; fall back silently
             logger.warning("Instruments download failed (%s). Using in-memory demo instruments.", str(e))
@@ -271,21 +283,170 @@ def _create_demo_instruments() -> list:
 
 instruments = _load_or_download_instruments()
 
+# (EXCHANGE, TRADINGSYMBOL) -> token for resolve_tokens_by_symbols; rebuilt with the options index
+symbol_index: Dict[Tuple[str, str], int] = {}
+
+# Option contracts (NFO/BFO CE/PE) indexed by (NAME, EXPIRY, TYPE), plus each name's sorted
+# expiries, so the options endpoints do dict lookups instead of scanning the instrument dump.
+_options_index: Dict[Tuple[str, str, str], list] = {}
+_expiries_by_name: Dict[str, List[str]] = {}
+
+
+_OPT_EXCH = frozenset(("NFO", "BFO"))
+_OPT_TYPE = frozenset(("CE", "PE"))
+
+# Memoized, interned upper-case symbol/name strings (bounded so arbitrary input can't grow it forever)
+_UP: Dict[str, str] = {}
+_UP_MAX = 50000
+
+
+def _up(value: str) -> str:
+    u = _UP.get(value)
+    if u is None:
+        u = sys.intern(value.upper())
+        if len(_UP) < _UP_MAX:
+            _UP[value] = u
+    return u
+
+
+def _rebuild_instrument_indexes() -> None:
+    global symbol_index, _options_index, _expiries_by_name
+    symbol_index = build_symbol_index(instruments)
+    opts = [i for i in instruments if i.exchange in _OPT_EXCH and i.instrument_type in _OPT_TYPE]
+    opts.sort(key=lambda i: i.exchange != "NFO")  # NFO contracts ahead of BFO
+    index: Dict[Tuple[str, str, str], list] = defaultdict(list)
+    expiries: Dict[str, set] = {}
+    for i in opts:
+        name = _up(i.name or "")
+        index[(name, i.expiry or "", i.instrument_type)].append(i)
+        if i.expiry:
+            expiries.setdefault(name, set()).add(i.expiry)
+    _options_index = dict(index)
+    _expiries_by_name = {name: sorted(exps) for name, exps in expiries.items()}
+
+
+def _option_instruments(name: str, expiry: str, kind: str) -> list:
+    return _options_index.get((name, expiry, kind), [])
+
+
+def _option_expiries(name: str) -> List[str]:
+    return _expiries_by_name.get(name, [])
+
+
+_rebuild_instrument_indexes()
+
 latest_ticks: Dict[int, dict] = {}
 symbol_to_token: Dict[str, int] = {}
 token_to_symbol: Dict[int, str] = {}
+# Sorted int64 tokens with a parallel list of interned symbols, rebuilt when _token_version moves.
+# Swapped as one tuple so the ticker thread never sees a half-built pair.
+_token_index: Tuple[np.ndarray, List[str]] = (np.empty(0, dtype=np.int64), [])
+_token_index_version = 0
+# Bumped by every _index_symbols call, so a token remapped to a new symbol also triggers a rebuild
+_token_version = 0
+_token_lock = threading.Lock()
+
+
+def _index_symbols(mapping: Dict[str, int]) -> None:
+    """Record subscribed symbol <-> token pairs in both lookup dicts."""
+    global _token_version
+    with _token_lock:
+        for sym, tok in mapping.items():
+            sym = sys.intern(sym)
+            symbol_to_token[sym] = tok
+            token_to_symbol[tok] = sym
+        _token_version += 1
+
+
+def _get_token_index() -> Tuple[np.ndarray, List[str]]:
+    global _token_index, _token_index_version
+    if _token_index_version != _token_version:
+        # Snapshot under the lock; request threads may be adding tokens concurrently
+        with _token_lock:
+            version = _token_version
+            items = sorted(token_to_symbol.items())
+        _token_index = (
+            np.fromiter((tok for tok, _ in items), dtype=np.int64, count=len(items)),
+            [sys.intern(sym) for _, sym in items],
+        )
+        _token_index_version = version
+    return _token_index
+
+
+def _symbols_for_ticks(ticks: List[dict]) -> List[Optional[str]]:
+    """Resolve each tick's instrument_token to its subscribed symbol (None if unknown)."""
+    tok_arr, sym_arr = _get_token_index()
+    toks = np.fromiter((t.get("instrument_token") or 0 for t in ticks), dtype=np.int64, count=len(ticks))
+    out: List[Optional[str]] = [None] * len(ticks)
+    if len(sym_arr):
+        idx = np.minimum(np.searchsorted(tok_arr, toks), len(sym_arr) - 1)
+        for i in np.flatnonzero(tok_arr[idx] == toks).tolist():
+            out[i] = sym_arr[idx[i]]
+    # Tokens added since the last rebuild fall back to the dict
+    for i, sym in enumerate(out):
+        if sym is None and toks[i]:
+            out[i] = token_to_symbol.get(int(toks[i]))
+    return out
 
 ticker: Optional[MarketTicker] = None
+# Bumped per tick batch so the websocket broadcaster can skip unchanged snapshots
+_tick_seq = 0
+
+# Broker REST calls triggered from ticks run here so the KiteTicker thread never blocks.
+# Each symbol gets a FIFO lane drained by one pool task, so its orders stay in submission order.
+# A submission is coalesced only when it repeats the key of the newest task in its lane
+# (a signal keys on (symbol, side)); exits key on (symbol, "EXIT") and risk checks on
+# (symbol, "RISK"), and those are coalesced only against the same kind of task already
+# queued or running for that symbol.
+_order_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="orders")
+_order_lanes: Dict[str, deque] = {}
+_order_lanes_lock = threading.Lock()
+
+
+def _drain_order_lane(symbol: str) -> None:
+    with _order_lanes_lock:
+        lane = _order_lanes[symbol]
+    while True:
+        key, fn, args, kwargs = lane[0]
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            logger.exception("Order task failed for %s", symbol)
+        with _order_lanes_lock:
+            lane.popleft()
+            if not lane:
+                del _order_lanes[symbol]
+                return
+
+
+def _submit_order_task(key: tuple, fn, *args, **kwargs) -> bool:
+    symbol = key[0]
+    with _order_lanes_lock:
+        lane = _order_lanes.get(symbol)
+        if lane is not None:
+            if key[1] in ("EXIT", "RISK"):
+                if any(k == key for k, *_ in lane):
+                    return False
+            elif lane[-1][0] == key:
+                return False
+            lane.append((key, fn, args, kwargs))
+            return True
+        _order_lanes[symbol] = deque([(key, fn, args, kwargs)])
+    _order_pool.submit(_drain_order_lane, symbol)
+    return True
 
 # Strategy state
 strategy_active: bool = False
 strategy_live: bool = False
 strategy_exchange: str = "NSE"
 strategy: Optional[BaseStrategy] = None
-last_strategy_signals: List[dict] = []
+last_strategy_signals: deque = deque(maxlen=10)
 
-# Order log (paper + live)
-order_log: List[dict] = []
+# Order log (paper + live), capped at the most recent 50k entries.
+# Every append also lands in _order_store, which keeps holdings/PnL for the full history.
+# Orders logged without an exchange are filed under the running strategy's exchange.
+_order_store = OrderStore()
+order_log = OrderLog(_order_store, maxlen=50000, default_exchange=lambda: strategy_exchange)
 
 # Risk management
 risk_sl_pct: float = 0.02  # 2% stop-loss
@@ -340,6 +501,29 @@ auth_cache = {
     "access_token": None
 }
 
+# /status and /status/all re-validate the token with profile() at most this often;
+# the Kite access token expires daily, so the 24h auth_cache is too coarse for them.
+_STATUS_AUTH_TTL = 300.0
+_status_auth: Dict[str, object] = {"checked": None, "auth": False, "user_id": None}
+
+
+def _status_auth_check() -> Tuple[bool, Optional[str]]:
+    now = time.monotonic()
+    checked = _status_auth["checked"]
+    if checked is not None and now - checked < _STATUS_AUTH_TTL:
+        return _status_auth["auth"], _status_auth["user_id"]
+    try:
+        prof = broker.kite.profile()
+        auth, user_id = True, prof.get("user_id")
+    except Exception:
+        auth, user_id = False, None
+    _status_auth.update(checked=now, auth=auth, user_id=user_id)
+    return auth, user_id
+
+
+def _clear_status_auth() -> None:
+    _status_auth["checked"] = None
+
 # Trading hours (IST)
 TRADING_HOURS = {
     "equity": {"start": "09:15", "end": "15:30"},
@@ -412,31 +596,198 @@ def ensure_ticker(mode_full: bool) -> MarketTicker:
     return ticker
 
 
+def _execute_signal(s: Signal, name: str, ltp_of: Optional[Callable[[str], float]] = None) -> None:
+    """Execute one strategy signal (paper or live); runs on the order pool."""
+    if ltp_of is None:
+        ltp_of = lambda sym: _get_ltp_for_symbol(strategy_exchange, sym)
+    if cfg.dry_run or not strategy_live:
+        qty_calc = s.quantity
+        if ai_active:
+            price = ltp_of(s.symbol)
+            if price > 0:
+                qty_calc = max(1, int(ai_trade_capital / price))
+        # If options symbol, convert qty_calc lots -> contracts when small integers are used
+        if ("CE" in s.symbol or "PE" in s.symbol) and qty_calc in {1, 2, 3, 4, 5, 10}:
+            lot = 75
+            if "BANKNIFTY" in s.symbol:
+                lot = 35
+            elif "SENSEX" in s.symbol:
+                lot = 20
+            elif "FINNIFTY" in s.symbol:
+                lot = 40
+            qty_calc = qty_calc * lot
+        # Options-touch execution: place ATM CE+PE entries/exits when underlying triggers
+        if name == "options_touch_sma":
+            try:
+                # fetch ATM CE/PE from options chain helper (reuse options_atm_trade logic by simulating offset=0)
+                # For DRY mode, emulate two orders at LTP
+                under = s.symbol
+                # Derive closest ATM CE/PE using /options/atm_trade logic
+                chain = _options_chain(under, "next", count=50, around=None)
+                strikes = chain.get("strikes", [])
+                if strikes:
+                    mid = strikes[len(strikes)//2]
+                    ce_sorted = sorted(chain.get("ce", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
+                    pe_sorted = sorted(chain.get("pe", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
+                    # determine offset and quantity from strategy if available
+                    try:
+                        off = int(getattr(strategy, "offset", 0) or 0)
+                        qtyo = int(getattr(strategy, "quantity", 1) or 1)
+                    except Exception:
+                        off = 0; qtyo = 1
+                    ce_idx = min(len(ce_sorted)-1, max(0, off))
+                    pe_idx = min(len(pe_sorted)-1, max(0, off))
+                    picks = []
+                    if ce_sorted: picks.append(ce_sorted[ce_idx].get("tradingsymbol"))
+                    if pe_sorted: picks.append(pe_sorted[pe_idx].get("tradingsymbol"))
+                    for symo in [p for p in picks if p]:
+                        px = _get_ltp_for_symbol("NFO", symo)
+                        sideo = "BUY" if s.side == "BUY" else "SELL"
+                        _record_order(symo, "NFO", sideo, qtyo, px, True, source="options-touch")
+            except Exception:
+                pass
+        else:
+            logger.info("[DRY] Strategy signal %s %s qty=%s", s.side, s.symbol, qty_calc)
+            _record_order(s.symbol, strategy_exchange, s.side, qty_calc, ltp_of(s.symbol), True, source=("ai-" + name) if ai_active else ("strategy-" + name))
+        return
+    txn_type = broker.kite.TRANSACTION_TYPE_BUY if s.side == "BUY" else broker.kite.TRANSACTION_TYPE_SELL
+    try:
+        qty_live = s.quantity
+        if ai_active:
+            price = ltp_of(s.symbol)
+            if price > 0:
+                qty_live = max(1, int(ai_trade_capital / price))
+        # Convert lots to contracts for options in live as well
+        if ("CE" in s.symbol or "PE" in s.symbol) and qty_live in {1, 2, 3, 4, 5, 10}:
+            lot_l = 75
+            if "BANKNIFTY" in s.symbol:
+                lot_l = 35
+            elif "SENSEX" in s.symbol:
+                lot_l = 20
+            elif "FINNIFTY" in s.symbol:
+                lot_l = 40
+            qty_live = qty_live * lot_l
+        if name == "options_touch_sma":
+            # Live: place ATM CE/PE market orders
+            try:
+                under = s.symbol
+                chain = _options_chain(under, "next", count=50, around=None)
+                strikes = chain.get("strikes", [])
+                if strikes:
+                    mid = strikes[len(strikes)//2]
+                    ce_sorted = sorted(chain.get("ce", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
+                    pe_sorted = sorted(chain.get("pe", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
+                    try:
+                        off = int(getattr(strategy, "offset", 0) or 0)
+                        qtyo = int(getattr(strategy, "quantity", 1) or 1)
+                    except Exception:
+                        off = 0; qtyo = 1
+                    ce_idx = min(len(ce_sorted)-1, max(0, off))
+                    pe_idx = min(len(pe_sorted)-1, max(0, off))
+                    picks = []
+                    if ce_sorted: picks.append(ce_sorted[ce_idx].get("tradingsymbol"))
+                    if pe_sorted: picks.append(pe_sorted[pe_idx].get("tradingsymbol"))
+                    for symo in [p for p in picks if p]:
+                        txn = broker.kite.TRANSACTION_TYPE_BUY if s.side == "BUY" else broker.kite.TRANSACTION_TYPE_SELL
+                        broker.place_market_order(tradingsymbol=symo, exchange="NFO", quantity=qtyo, transaction_type=txn)
+                        px = _get_ltp_for_symbol("NFO", symo)
+                        _record_order(symo, "NFO", "BUY" if s.side == "BUY" else "SELL", qtyo, px, False, source="options-touch")
+            except Exception:
+                logger.exception("options_touch live place failed")
+        else:
+            broker.place_market_order(
+                tradingsymbol=s.symbol,
+                exchange=strategy_exchange,
+                quantity=qty_live,
+                transaction_type=txn_type,
+            )
+            _record_order(s.symbol, strategy_exchange, s.side, qty_live, ltp_of(s.symbol), False, source=("ai-" + name) if ai_active else ("strategy-" + name))
+    except Exception:
+        logger.exception("Order placement failed for %s", s.symbol)
+
+
+def _auto_close_check(sym: str, qty: int, avg: float, ltp: float) -> None:
+    """SL/TP/trailing-stop evaluation for one holding; exits go to the symbol's order lane."""
+    if risk_sl_pct > 0 and ltp <= avg * (1.0 - risk_sl_pct):
+        _submit_order_task((sym, "EXIT"), _square_off, sym, qty, reason="SL")
+    elif risk_tp_pct > 0 and ltp >= avg * (1.0 + risk_tp_pct):
+        _submit_order_task((sym, "EXIT"), _square_off, sym, qty, reason="TP")
+    # Trailing stop logic
+    try:
+        # choose per-symbol override if set
+        k = f"{strategy_exchange}:{sym}"
+        pct = float(trailing_overrides_pct.get(k, trailing_stop_pct))
+        pts_override = float(trailing_overrides_points.get(k, 0.0) or 0.0)
+        st = trailing_state.setdefault(k, {"max": ltp, "min": ltp, "trail_price": 0.0, "activated": False, "entry": float(avg)})
+        # Update running extremes for both sides
+        if qty > 0:
+            # Long position: move max up and compute trailing by pct or points
+            st["max"] = max(st.get("max", ltp), ltp)
+            # Activate trailing once profit >= activation threshold
+            if not st.get("activated") and (ltp - st.get("entry", avg)) >= max(0.0, trailing_activation_points):
+                st["activated"] = True
+            trail_pct = st["max"] * (1.0 - max(0.0, pct)) if pct > 0 else None
+            # Use points override after activation; else global points
+            base_points = pts_override if (st.get("activated") and pts_override > 0) else trailing_points_after_activation if st.get("activated") else trailing_stop_points
+            trail_pts = st["max"] - max(0.0, base_points)
+            # choose the tighter stop if both configured
+            candidates = [v for v in [trail_pct, trail_pts] if v and v > 0]
+            if candidates:
+                st["trail_price"] = max(candidates)
+                if ltp <= st["trail_price"]:
+                    _submit_order_task((sym, "EXIT"), _square_off, sym, qty, reason="TRAIL")
+        elif qty < 0:
+            # Short position: move min down and compute trailing
+            st["min"] = min(st.get("min", ltp), ltp)
+            if not st.get("activated") and (st.get("entry", avg) - ltp) >= max(0.0, trailing_activation_points):
+                st["activated"] = True
+            trail_pct = st["min"] * (1.0 + max(0.0, pct)) if pct > 0 else None
+            base_points = pts_override if (st.get("activated") and pts_override > 0) else trailing_points_after_activation if st.get("activated") else trailing_stop_points
+            trail_pts = st["min"] + max(0.0, base_points)
+            candidates = [v for v in [trail_pct, trail_pts] if v and v > 0]
+            if candidates:
+                st["trail_price"] = min(candidates)
+                if ltp >= st["trail_price"]:
+                    _submit_order_task((sym, "EXIT"), _square_off, sym, -qty, reason="TRAIL")
+    except Exception:
+        pass
+
+
 def _on_ticks(ticks: List[dict]) -> None:
-    for t in ticks:
+    global _tick_seq
+    _tick_seq += 1
+    symbols = _symbols_for_ticks(ticks)
+    for t, sym in zip(ticks, symbols):
         tok = t.get("instrument_token")
         if tok:
             latest_ticks[tok] = t
-            if tok in token_to_symbol:
-                t["symbol"] = token_to_symbol[tok]
+            if sym:
+                t["symbol"] = sym
     # Strategy processing
-    global strategy_active, strategy, last_strategy_signals
+    global strategy_active, strategy
     if strategy_active and strategy is not None:
-        # Attach _symbol for strategy compatibility
+        batch = None
         enriched: List[dict] = []
-        for t in ticks:
-            tok = t.get("instrument_token")
-            sym = token_to_symbol.get(tok)
-            if not sym:
-                continue
-            tt = dict(t)
-            tt["_symbol"] = sym
-            enriched.append(tt)
-        if not enriched:
-            return
+        if strategy.BATCHED:
+            # Compiled strategies take (row, price) arrays built straight from the batch
+            batch = strategy.batch_arrays(symbols, [t.get("_px") for t in ticks])
+            if batch[0].size == 0:
+                return
+        else:
+            # Attach _symbol for strategy compatibility
+            for t, sym in zip(ticks, symbols):
+                if not sym:
+                    continue
+                tt = dict(t)
+                tt["_symbol"] = sym
+                enriched.append(tt)
+            if not enriched:
+                return
         try:
-            signals = strategy.on_ticks(enriched)
-            last_strategy_signals = [s.__dict__ for s in signals]
+            signals = strategy.on_batch(*batch) if batch is not None else strategy.on_ticks(enriched)
+            if signals:
+                # Signal is slotted (no __dict__); only the newest entries survive the bounded deque
+                last_strategy_signals.extend(asdict(s) for s in signals[-last_strategy_signals.maxlen:])
             def _strategy_name():
                 try:
                     if isinstance(strategy, SmaCrossoverStrategy):
@@ -459,111 +810,10 @@ def _on_ticks(ticks: List[dict]) -> None:
                     pass
                 return "unknown"
             name = _strategy_name()
-            for s in signals:
-                if cfg.dry_run or not strategy_live:
-                    qty_calc = s.quantity
-                    if ai_active:
-                        price = _get_ltp_for_symbol(strategy_exchange, s.symbol)
-                        if price > 0:
-                            qty_calc = max(1, int(ai_trade_capital / price))
-                    # If options symbol, convert qty_calc lots -> contracts when small integers are used
-                    if ("CE" in s.symbol or "PE" in s.symbol) and qty_calc in {1, 2, 3, 4, 5, 10}:
-                        lot = 75
-                        if "BANKNIFTY" in s.symbol:
-                            lot = 35
-                        elif "SENSEX" in s.symbol:
-                            lot = 20
-                        elif "FINNIFTY" in s.symbol:
-                            lot = 40
-                        qty_calc = qty_calc * lot
-                    # Options-touch execution: place ATM CE+PE entries/exits when underlying triggers
-                    if name == "options_touch_sma":
-                        try:
-                            # fetch ATM CE/PE from options chain helper (reuse options_atm_trade logic by simulating offset=0)
-                            # For DRY mode, emulate two orders at LTP
-                            under = s.symbol
-                            # Derive closest ATM CE/PE using /options/atm_trade logic
-                            chain = options_chain(under, "next", count=50, around=None)
-                            strikes = chain.get("strikes", [])
-                            if strikes:
-                                mid = strikes[len(strikes)//2]
-                                ce_sorted = sorted(chain.get("ce", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
-                                pe_sorted = sorted(chain.get("pe", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
-                                # determine offset and quantity from strategy if available
-                                try:
-                                    off = int(getattr(strategy, "offset", 0) or 0)
-                                    qtyo = int(getattr(strategy, "quantity", 1) or 1)
-                                except Exception:
-                                    off = 0; qtyo = 1
-                                ce_idx = min(len(ce_sorted)-1, max(0, off))
-                                pe_idx = min(len(pe_sorted)-1, max(0, off))
-                                picks = []
-                                if ce_sorted: picks.append(ce_sorted[ce_idx].get("tradingsymbol"))
-                                if pe_sorted: picks.append(pe_sorted[pe_idx].get("tradingsymbol"))
-                                for symo in [p for p in picks if p]:
-                                    px = _get_ltp_for_symbol("NFO", symo)
-                                    sideo = "BUY" if s.side == "BUY" else "SELL"
-                                    _record_order(symo, "NFO", sideo, qtyo, px, True, source="options-touch")
-                        except Exception:
-                            pass
-                    else:
-                        logger.info("[DRY] Strategy signal %s %s qty=%s", s.side, s.symbol, qty_calc)
-                        _record_order(s.symbol, strategy_exchange, s.side, qty_calc, _get_ltp_for_symbol(strategy_exchange, s.symbol), True, source=("ai-" + name) if ai_active else ("strategy-" + name))
-                    continue
-                txn_type = broker.kite.TRANSACTION_TYPE_BUY if s.side == "BUY" else broker.kite.TRANSACTION_TYPE_SELL
-                try:
-                    qty_live = s.quantity
-                    if ai_active:
-                        price = _get_ltp_for_symbol(strategy_exchange, s.symbol)
-                        if price > 0:
-                            qty_live = max(1, int(ai_trade_capital / price))
-                    # Convert lots to contracts for options in live as well
-                    if ("CE" in s.symbol or "PE" in s.symbol) and qty_live in {1, 2, 3, 4, 5, 10}:
-                        lot_l = 75
-                        if "BANKNIFTY" in s.symbol:
-                            lot_l = 35
-                        elif "SENSEX" in s.symbol:
-                            lot_l = 20
-                        elif "FINNIFTY" in s.symbol:
-                            lot_l = 40
-                        qty_live = qty_live * lot_l
-                    if name == "options_touch_sma":
-                        # Live: place ATM CE/PE market orders
-                        try:
-                            under = s.symbol
-                            chain = options_chain(under, "next", count=50, around=None)
-                            strikes = chain.get("strikes", [])
-                            if strikes:
-                                mid = strikes[len(strikes)//2]
-                                ce_sorted = sorted(chain.get("ce", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
-                                pe_sorted = sorted(chain.get("pe", []), key=lambda x: abs(float(x.get("strike", 0)) - mid))
-                                try:
-                                    off = int(getattr(strategy, "offset", 0) or 0)
-                                    qtyo = int(getattr(strategy, "quantity", 1) or 1)
-                                except Exception:
-                                    off = 0; qtyo = 1
-                                ce_idx = min(len(ce_sorted)-1, max(0, off))
-                                pe_idx = min(len(pe_sorted)-1, max(0, off))
-                                picks = []
-                                if ce_sorted: picks.append(ce_sorted[ce_idx].get("tradingsymbol"))
-                                if pe_sorted: picks.append(pe_sorted[pe_idx].get("tradingsymbol"))
-                                for symo in [p for p in picks if p]:
-                                    txn = broker.kite.TRANSACTION_TYPE_BUY if s.side == "BUY" else broker.kite.TRANSACTION_TYPE_SELL
-                                    broker.place_market_order(tradingsymbol=symo, exchange="NFO", quantity=qtyo, transaction_type=txn)
-                                    px = _get_ltp_for_symbol("NFO", symo)
-                                    _record_order(symo, "NFO", "BUY" if s.side == "BUY" else "SELL", qtyo, px, False, source="options-touch")
-                        except Exception:
-                            logger.exception("options_touch live place failed")
-                    else:
-                        broker.place_market_order(
-                            tradingsymbol=s.symbol,
-                            exchange=strategy_exchange,
-                            quantity=qty_live,
-                            transaction_type=txn_type,
-                        )
-                        _record_order(s.symbol, strategy_exchange, s.side, qty_live, _get_ltp_for_symbol(strategy_exchange, s.symbol), False, source=("ai-" + name) if ai_active else ("strategy-" + name))
-                except Exception:
-                    logger.exception("Order placement failed for %s", s.symbol)
+            if signals:
+                ltp_of = _ltp_batch(strategy_exchange, [s.symbol for s in signals])
+                for s in signals:
+                    _submit_order_task((s.symbol, s.side), _execute_signal, s, name, ltp_of)
         except Exception:
             logger.exception("Strategy on_ticks failed")
     # Auto close based on risk settings
@@ -575,50 +825,18 @@ def _on_ticks(ticks: List[dict]) -> None:
                 avg = h.get("avg_price", 0.0)
                 if qty <= 0 or avg <= 0:
                     continue
-                ltp = _get_ltp_for_symbol(strategy_exchange, sym)
-                if risk_sl_pct > 0 and ltp <= avg * (1.0 - risk_sl_pct):
-                    _square_off(sym, qty, reason="SL")
-                elif risk_tp_pct > 0 and ltp >= avg * (1.0 + risk_tp_pct):
-                    _square_off(sym, qty, reason="TP")
-                # Trailing stop logic
-                try:
-                    # choose per-symbol override if set
-                    k = f"{strategy_exchange}:{sym}"
-                    pct = float(trailing_overrides_pct.get(k, trailing_stop_pct))
-                    pts_override = float(trailing_overrides_points.get(k, 0.0) or 0.0)
-                    st = trailing_state.setdefault(k, {"max": ltp, "min": ltp, "trail_price": 0.0, "activated": False, "entry": float(avg)})
-                    # Update running extremes for both sides
-                    if qty > 0:
-                        # Long position: move max up and compute trailing by pct or points
-                        st["max"] = max(st.get("max", ltp), ltp)
-                        # Activate trailing once profit >= activation threshold
-                        if not st.get("activated") and (ltp - st.get("entry", avg)) >= max(0.0, trailing_activation_points):
-                            st["activated"] = True
-                        trail_pct = st["max"] * (1.0 - max(0.0, pct)) if pct > 0 else None
-                        # Use points override after activation; else global points
-                        base_points = pts_override if (st.get("activated") and pts_override > 0) else trailing_points_after_activation if st.get("activated") else trailing_stop_points
-                        trail_pts = st["max"] - max(0.0, base_points)
-                        # choose the tighter stop if both configured
-                        candidates = [v for v in [trail_pct, trail_pts] if v and v > 0]
-                        if candidates:
-                            st["trail_price"] = max(candidates)
-                            if ltp <= st["trail_price"]:
-                                _square_off(sym, qty, reason="TRAIL")
-                    elif qty < 0:
-                        # Short position: move min down and compute trailing
-                        st["min"] = min(st.get("min", ltp), ltp)
-                        if not st.get("activated") and (st.get("entry", avg) - ltp) >= max(0.0, trailing_activation_points):
-                            st["activated"] = True
-                        trail_pct = st["min"] * (1.0 + max(0.0, pct)) if pct > 0 else None
-                        base_points = pts_override if (st.get("activated") and pts_override > 0) else trailing_points_after_activation if st.get("activated") else trailing_stop_points
-                        trail_pts = st["min"] + max(0.0, base_points)
-                        candidates = [v for v in [trail_pct, trail_pts] if v and v > 0]
-                        if candidates:
-                            st["trail_price"] = min(candidates)
-                            if ltp >= st["trail_price"]:
-                                _square_off(sym, -qty, reason="TRAIL")
-                except Exception:
-                    pass
+                # Only the tick cache is read here; a holding without a tick is priced
+                # (possibly over REST) and evaluated on its order lane instead
+                ltp = _tick_ltp(strategy_exchange, sym)
+                if ltp > 0:
+                    _auto_close_check(sym, qty, avg, ltp)
+                else:
+                    _submit_order_task(
+                        (sym, "RISK"),
+                        lambda sym=sym, qty=qty, avg=avg: _auto_close_check(
+                            sym, qty, avg, _get_ltp_for_symbol(strategy_exchange, sym)
+                        ),
+                    )
         except Exception:
             logger.exception("Auto close evaluation failed")
 
@@ -646,9 +864,9 @@ def _on_ticks(ticks: List[dict]) -> None:
             if len(closes) < 3:
                 continue
             if q > 0 and closes[0] > closes[1] > closes[2]:
-                _square_off(sym, q, reason="3RED")
+                _submit_order_task((sym, "EXIT"), _square_off, sym, q, reason="3RED")
             elif q < 0 and closes[0] < closes[1] < closes[2]:
-                _square_off(sym, -q, reason="3GREEN")
+                _submit_order_task((sym, "EXIT"), _square_off, sym, -q, reason="3GREEN")
     except Exception:
         pass
 
@@ -686,18 +904,17 @@ def subscribe(req: SubscribeRequest):
     if not auth_ok:
         return {"error": "NOT_AUTHENTICATED", "message": "Login required. Use /auth/login_url then /auth/exchange."}
     ensure_ticker(mode_full=mode_full)
-    mapping = resolve_tokens_by_symbols(instruments, req.symbols, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, req.symbols, exchange=req.exchange)
     if not mapping:
         return {"subscribed": [], "missing": req.symbols}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ticker.subscribe(mapping.values())
     return {"subscribed": list(mapping.keys())}
 
 
 @app.post("/unsubscribe")
 def unsubscribe(req: SubscribeRequest):
-    mapping = {s: symbol_to_token.get(s.upper()) for s in req.symbols}
+    mapping = {s: symbol_to_token.get(_up(s)) for s in req.symbols}
     tokens = [t for t in mapping.values() if t]
     if not tokens:
         return {"unsubscribed": []}
@@ -761,6 +978,7 @@ def auth_exchange(req: ExchangeRequest):
     # Set in runtime
     cfg.access_token = access_token
     broker.kite.set_access_token(access_token)
+    _clear_status_auth()
     
     # Update authentication cache
     try:
@@ -772,6 +990,9 @@ def auth_exchange(req: ExchangeRequest):
         auth_cache["access_token"] = access_token
         logger.info("Authentication successful for user: %s (cached for 24 hours)", user_id)
     except Exception as e:
+        # Drop any entry cached for the previous token so the next check re-validates
+        auth_cache["is_authenticated"] = False
+        auth_cache["last_check"] = 0
         logger.warning("Failed to verify authentication after token exchange: %s", str(e))
     
     # Reset ticker so next subscribe uses fresh token
@@ -782,13 +1003,8 @@ def auth_exchange(req: ExchangeRequest):
         try:
             data_ins = broker.instruments()
             if data_ins:
-                csv_path = Path(cfg.instruments_csv_path)
-                csv_path.parent.mkdir(parents=True, exist_ok=True)
-                with csv_path.open("w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=data_ins[0].keys())
-                    writer.writeheader()
-                    writer.writerows(data_ins)
-                instruments = load_instruments(str(csv_path))
+                instruments = load_instruments(_write_instruments(data_ins))
+                _rebuild_instrument_indexes()
                 refreshed = len(instruments)
         except Exception:
             logger.exception("Failed to refresh instruments after exchange")
@@ -841,6 +1057,7 @@ def auth_clear_cache():
     auth_cache["user_id"] = None
     auth_cache["last_check"] = 0
     auth_cache["access_token"] = None
+    _clear_status_auth()
     logger.info("Authentication cache cleared")
     return {"status": "Cache cleared", "message": "Next request will require re-authentication"}
 
@@ -1014,38 +1231,92 @@ async def websocket_notifications(websocket: WebSocket):
 
 @app.get("/status")
 def status():
-    try:
-        prof = broker.kite.profile()
-        return {"auth": True, "user_id": prof.get("user_id"), "dry_run": cfg.dry_run}
-    except Exception:
-        # For GitHub/demo environment, return mock auth status
-        if cfg.zerodha_api_key == "demo_key":
-            return {"auth": True, "user_id": "DEMO_USER", "dry_run": True, "demo_mode": True}
-        return {"auth": False, "dry_run": cfg.dry_run}
+    # For GitHub/demo environment, return mock auth status
+    if cfg.zerodha_api_key == "demo_key":
+        return {"auth": True, "user_id": "DEMO_USER", "dry_run": True, "demo_mode": True}
+    # profile() is only hit once per _STATUS_AUTH_TTL
+    auth_ok, user_id = _status_auth_check()
+    if auth_ok:
+        return {"auth": True, "user_id": user_id, "dry_run": cfg.dry_run}
+    return {"auth": False, "dry_run": cfg.dry_run}
+
+
+# Tick snapshot shared by all /ws/ticks clients: serialized once per broadcast, not once per client.
+# Each publish swaps in a fresh Event and sets the old one, waking every waiting client.
+_WS_BROADCAST_INTERVAL = 0.05
+_ws_payload: bytes = b""
+_ws_event = asyncio.Event()
+_ws_clients = 0
+# Columnar frame {"cols": TICK_COLS, "rows": [[...], ...]}: field names are sent once per frame
+TICK_COLS = ("instrument_token", "symbol", "last_price", "volume_traded", "ohlc.close")
+
+
+def _ticks_snapshot_bytes() -> bytes:
+    rows = []
+    for tok, t in list(latest_ticks.items())[:2000]:
+        s = token_to_symbol.get(tok)
+        if s:
+            rows.append([
+                tok,
+                s,
+                t.get("last_price") or t.get("last_traded_price") or t.get("ltp"),
+                t.get("volume_traded"),
+                (t.get("ohlc") or {}).get("close"),
+            ])
+    return orjson.dumps({"cols": TICK_COLS, "rows": rows})
+
+
+async def _ws_broadcaster() -> None:
+    global _ws_payload, _ws_event
+    last_seen = None
+    while True:
+        await asyncio.sleep(_WS_BROADCAST_INTERVAL)
+        try:
+            # Skip work with no listeners or no new ticks since the last publish
+            if not _ws_clients or last_seen == (len(latest_ticks), _tick_seq):
+                continue
+            last_seen = (len(latest_ticks), _tick_seq)
+            _ws_payload = _ticks_snapshot_bytes()
+            event, _ws_event = _ws_event, asyncio.Event()
+            event.set()
+        except Exception:
+            logger.exception("WebSocket broadcaster error")
 
 
 @app.websocket("/ws/ticks")
 async def ws_ticks(ws: WebSocket):
+    global _ws_clients
     await ws.accept()
+    _ws_clients += 1
+    # Race each broadcast against the client's next message, so a close frame ends the
+    # handler even while no ticks are flowing (market closed, ticker down)
+    receiver = asyncio.ensure_future(ws.receive())
+    waiter: Optional[asyncio.Future] = None
     try:
+        if _ws_payload:
+            await ws.send_bytes(_ws_payload)
         while True:
-            await asyncio.sleep(0.5)
-            # Send latest snapshot of all subscribed tokens
-            payload = []
-            for tok, t in list(latest_ticks.items())[:2000]:
-                s = token_to_symbol.get(tok)
-                if s:
-                    t = dict(t)
-                    t["symbol"] = s
-                    payload.append(t)
-            await ws.send_bytes(orjson.dumps({"ticks": payload}))
+            waiter = asyncio.ensure_future(_ws_event.wait())
+            done, _ = await asyncio.wait({waiter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    return
+                # Client messages carry nothing for this feed
+                receiver = asyncio.ensure_future(ws.receive())
+                continue
+            await ws.send_bytes(_ws_payload)
     except WebSocketDisconnect:
         return
+    finally:
+        receiver.cancel()
+        if waiter is not None:
+            waiter.cancel()
+        _ws_clients -= 1
 
 
 @app.get("/symbols/search")
-def symbols_search(q: str, exchange: Optional[str] = None, limit: int = 20):
-    items = search_symbols(instruments, q, exchange=exchange, limit=limit)
+async def symbols_search(q: str, exchange: Optional[str] = None, limit: int = 20):
+    items = await asyncio.to_thread(search_symbols, instruments, q, exchange, limit)
     return [
         {
             "instrument_token": i.instrument_token,
@@ -1059,42 +1330,21 @@ def symbols_search(q: str, exchange: Optional[str] = None, limit: int = 20):
 
 
 @app.get("/ltp")
-def ltp(symbols: str, exchange: str = "NSE"):
-    sym_list = [s.strip().upper() for s in (symbols or "").split(",") if s.strip()]
+async def ltp(symbols: str, exchange: str = "NSE"):
+    sym_list = [_up(s.strip()) for s in (symbols or "").split(",") if s.strip()]
     if not sym_list:
         return {}
     # Require authentication
     # Check authentication or demo mode
-    auth_ok, user_id = _check_auth_or_demo()
+    auth_ok, user_id = await asyncio.to_thread(_check_auth_or_demo)
     if not auth_ok:
         return {"error": "NOT_AUTHENTICATED"}
-    # Prefer latest websocket tick per symbol; fallback to broker LTP API per symbol
-    out = {}
+    # Prefer latest websocket tick per symbol; one broker LTP call for the rest
     try:
-        mapping = resolve_tokens_by_symbols(instruments, sym_list, exchange=exchange)
+        prices = await asyncio.to_thread(_get_ltps_for_symbols, exchange, sym_list)
     except Exception:
-        mapping = {}
-    for sym in sym_list:
-        price = 0.0
-        try:
-            tok = mapping.get(sym)
-            if tok and tok in latest_ticks:
-                t = latest_ticks.get(tok) or {}
-                price = float(t.get("last_price") or t.get("last_traded_price") or t.get("ltp") or 0)
-        except Exception:
-            pass
-        if not price or price <= 0:
-            try:
-                data = broker.get_ltp({f"{exchange}:{sym}": sym})
-                rec = data.get(f"{exchange}:{sym}") or {}
-                price = float(rec.get("last_price") or rec.get("last_traded_price") or rec.get("ltp") or 0)
-            except Exception:
-                price = 0.0
-        if price and price > 0:
-            out[sym] = price
-        else:
-            out[sym] = 0.0
-    return out
+        prices = {}
+    return {sym: prices.get(sym, 0.0) for sym in sym_list}
 
 
 @app.get("/quote")
@@ -1151,7 +1401,7 @@ def history(symbol: Optional[str] = None, exchange: str = "NSE", interval: str =
             parts = key.split(":", 1)
             ex = parts[0].upper()
             sym = parts[1].upper()
-        mapping = resolve_tokens_by_symbols(instruments, [sym], exchange=ex)
+        mapping = resolve_tokens_by_symbols(symbol_index, [sym], exchange=ex)
         token = mapping.get(sym)
         if not token:
             # Fallback: try quote() to get instrument_token (works for indices)
@@ -1276,18 +1526,70 @@ def detect_candlestick_patterns(symbol: str, exchange: str = "NSE", interval: st
         return {"patterns": [], "count": 0}
 
 
-def _get_ltp_for_symbol(exchange: str, symbol: str) -> float:
-    # 1) Try latest websocket tick if we have the token
+def _get_ltps_for_symbols(exchange: str, symbols: List[str]) -> Dict[str, float]:
+    """Batch LTPs: websocket ticks first, then a single broker LTP call for the rest."""
+    out: Dict[str, float] = {}
+    missing: List[str] = []
+    mapping = resolve_tokens_by_symbols(symbol_index, symbols, exchange=exchange)
+    for sym in symbols:
+        t = latest_ticks.get(mapping.get(sym)) or {}
+        price_tick = float(t.get("last_price") or t.get("last_traded_price") or t.get("ltp") or 0)
+        if price_tick > 0:
+            out[sym] = price_tick
+        else:
+            missing.append(sym)
+    if missing:
+        try:
+            data = broker.get_ltp({f"{exchange}:{sym}": sym for sym in missing}) or {}
+            for sym in missing:
+                rec = data.get(f"{exchange}:{sym}") or {}
+                price_api = float(rec.get("last_price") or rec.get("last_traded_price") or rec.get("ltp") or 0)
+                if price_api > 0:
+                    out[sym] = price_api
+        except Exception:
+            pass
+    return out
+
+
+def _ltp_batch(exchange: str, symbols: List[str]) -> Callable[[str], float]:
+    """Return ltp_of(symbol) that fetches all ``symbols`` in one round-trip on first use.
+
+    Symbols the batch could not price fall back to _get_ltp_for_symbol.
+    """
+    lock = threading.Lock()
+    cache: Dict[str, float] = {}
+    fetched = False
+
+    def ltp_of(symbol: str) -> float:
+        nonlocal fetched
+        with lock:
+            if not fetched:
+                cache.update(_get_ltps_for_symbols(exchange, list(dict.fromkeys(symbols))))
+                fetched = True
+        price = cache.get(symbol, 0.0)
+        return price if price > 0 else _get_ltp_for_symbol(exchange, symbol)
+
+    return ltp_of
+
+
+def _tick_ltp(exchange: str, symbol: str) -> float:
+    """Last price from the websocket tick cache only (0.0 if none); never calls the broker."""
     try:
-        mapping = resolve_tokens_by_symbols(instruments, [symbol], exchange=exchange)
+        mapping = resolve_tokens_by_symbols(symbol_index, [symbol], exchange=exchange)
         tok = mapping.get(symbol)
         if tok and tok in latest_ticks:
             t = latest_ticks.get(tok) or {}
-            price_tick = float(t.get("last_price") or t.get("last_traded_price") or t.get("ltp") or 0)
-            if price_tick > 0:
-                return price_tick
+            return float(t.get("last_price") or t.get("last_traded_price") or t.get("ltp") or 0)
     except Exception:
         pass
+    return 0.0
+
+
+def _get_ltp_for_symbol(exchange: str, symbol: str) -> float:
+    # 1) Try latest websocket tick if we have the token
+    price_tick = _tick_ltp(exchange, symbol)
+    if price_tick > 0:
+        return price_tick
     
     # 1b) Fallback to broker LTP API for consistent pricing (equity/options)
     try:
@@ -1439,36 +1741,12 @@ def _record_order(symbol: str, exchange: str, side: str, quantity: int, price: f
 
 
 def _get_holdings() -> Dict[str, dict]:
-    # Build simple holdings from order_log (BUY positive, SELL negative)
-    holdings: Dict[str, dict] = {}
-    for o in order_log:
-        qty = o["quantity"] if o["side"] == "BUY" else -o["quantity"]
-        s = holdings.setdefault(o["symbol"], {"quantity": 0, "avg_price": 0.0, "exchange": o.get("exchange", strategy_exchange)})
-        s["exchange"] = o.get("exchange", s.get("exchange", strategy_exchange))
-        new_qty = s["quantity"] + qty
-        if new_qty > 0 and qty > 0:
-            # weighted average on buys
-            s["avg_price"] = (s["avg_price"] * s["quantity"] + o["price"] * qty) / max(new_qty, 1)
-        s["quantity"] = new_qty
-        if s["quantity"] <= 0:
-            s["avg_price"] = 0.0
-    return holdings
+    # Net holdings from order_log (BUY positive, SELL negative), weighted avg on buys
+    return _order_store.holdings()
 
 
 def _get_holdings_paper_only() -> Dict[str, dict]:
-    holdings: Dict[str, dict] = {}
-    for o in order_log:
-        if not o.get("dry_run"):
-            continue
-        qty = o["quantity"] if o["side"] == "BUY" else -o["quantity"]
-        s = holdings.setdefault(o["symbol"], {"quantity": 0, "avg_price": 0.0})
-        new_qty = s["quantity"] + qty
-        if new_qty > 0 and qty > 0:
-            s["avg_price"] = (s["avg_price"] * s["quantity"] + o["price"] * qty) / max(new_qty, 1)
-        s["quantity"] = new_qty
-        if s["quantity"] <= 0:
-            s["avg_price"] = 0.0
-    return holdings
+    return _order_store.holdings(paper_only=True)
 
 
 def _paper_equity_and_unrealized() -> Dict[str, float]:
@@ -1531,11 +1809,10 @@ def strategy_sma_start(req: SmaStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     # Init strategy
@@ -1560,7 +1837,7 @@ def strategy_status():
         "active": strategy_active,
         "live": strategy_live,
         "exchange": strategy_exchange,
-        "last_signals": last_strategy_signals[-10:],
+        "last_signals": list(last_strategy_signals),
     }
 
 
@@ -1582,11 +1859,10 @@ def strategy_ema_start(req: EmaStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = EmaCrossoverStrategy(symbols=list(mapping.keys()), short_window=req.short, long_window=req.long)
@@ -1615,11 +1891,10 @@ def strategy_rsi_start(req: RsiStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = RsiStrategy(symbols=list(mapping.keys()), period=req.period, 
@@ -1648,11 +1923,10 @@ def strategy_bollinger_start(req: BollingerStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = BollingerBandsStrategy(symbols=list(mapping.keys()), period=req.period, 
@@ -1682,11 +1956,10 @@ def strategy_macd_start(req: MacdStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = MacdStrategy(symbols=list(mapping.keys()), fast_period=req.fast_period,
@@ -1702,6 +1975,7 @@ class SupportResistanceStartRequest(BaseModel):
     exchange: str = "NSE"
     lookback_period: int = 50
     breakout_threshold: float = 0.01
+    bar_seconds: float = 60.0
     live: bool = False
 
 
@@ -1715,16 +1989,16 @@ def strategy_support_resistance_start(req: SupportResistanceStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = ai_default_symbols
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = SupportResistanceStrategy(symbols=list(mapping.keys()), 
                                         lookback_period=req.lookback_period,
-                                        breakout_threshold=req.breakout_threshold)
+                                        breakout_threshold=req.breakout_threshold,
+                                        bar_seconds=req.bar_seconds)
     strategy_active = True
     strategy_live = bool(req.live)
     strategy_exchange = req.exchange
@@ -1750,11 +2024,10 @@ def strategy_options_straddle_start(req: OptionsStraddleStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = [req.underlying]  # Use underlying as default symbol
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange="NSE")
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange="NSE")
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = OptionsStraddleStrategy(symbols=list(mapping.keys()), 
@@ -1788,11 +2061,10 @@ def strategy_options_strangle_start(req: OptionsStrangleStartRequest):
     syms = req.symbols or []
     if not syms:
         syms = [req.underlying]  # Use underlying as default symbol
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange="NSE")
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange="NSE")
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = OptionsStrangleStrategy(symbols=list(mapping.keys()), 
@@ -1824,11 +2096,10 @@ def strategy_options_touch_sma_start(req: OptionsTouchSmaStartRequest):
     if not auth_ok:
         return {"error": "NOT_AUTHENTICATED"}
     syms = req.symbols or []
-    mapping = resolve_tokens_by_symbols(instruments, syms, exchange=req.exchange)
+    mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange=req.exchange)
     if not mapping:
         return {"error": "SYMBOLS_NOT_FOUND", "symbols": syms}
-    symbol_to_token.update(mapping)
-    token_to_symbol.update({v: k for k, v in mapping.items()})
+    _index_symbols(mapping)
     ensure_ticker(mode_full=False)
     ticker.subscribe(mapping.values())
     strategy = OptionsTouchSmaStrategy(symbols=list(mapping.keys()), length=int(req.length or 21), offset=int(req.offset or 0), quantity=int(req.quantity or 1))
@@ -1840,95 +2111,37 @@ def strategy_options_touch_sma_start(req: OptionsTouchSmaStartRequest):
 
 @app.get("/orders")
 def orders():
-    return order_log[-200:]
+    # Returning the response directly skips jsonable_encoder's walk over every order dict
+    return ORJSONResponse(order_log.tail(200))
 
 
 @app.get("/pnl")
 def pnl():
-    # Calculate realized and unrealized PnL
-    realized = 0.0
+    # Realized PnL from FIFO lot matching; unrealized from the remaining open lots
+    store = _order_store
+    paper_realized, live_realized = store.realized_by_mode()
+    realized = paper_realized + live_realized
     unrealized = 0.0
-    
-    # Separate paper and live trades for better tracking
-    paper_realized = 0.0
     paper_unrealized = 0.0
-    live_realized = 0.0
     live_unrealized = 0.0
-    
-    # Process orders by symbol
-    symbol_orders = {}
-    for o in order_log:
-        symbol = o["symbol"]
-        if symbol not in symbol_orders:
-            symbol_orders[symbol] = []
-        symbol_orders[symbol].append(o)
-    
-    # Calculate PnL for each symbol
-    for symbol, orders in symbol_orders.items():
-        # Sort orders by timestamp
-        orders.sort(key=lambda x: x["ts"])
-        
-        # Separate buy and sell orders
-        buy_orders = [o for o in orders if o["side"] == "BUY"]
-        sell_orders = [o for o in orders if o["side"] == "SELL"]
-        
-        # Calculate realized PnL using FIFO
-        remaining_buys = buy_orders.copy()
-        
-        for sell_order in sell_orders:
-            sell_qty = sell_order["quantity"]
-            sell_price = sell_order["price"]
-            is_paper = sell_order.get("dry_run", True)
-            
-            while sell_qty > 0 and remaining_buys:
-                buy_order = remaining_buys[0]
-                buy_qty = buy_order["quantity"]
-                buy_price = buy_order["price"]
-                
-                # Take the minimum of sell quantity and remaining buy quantity
-                trade_qty = min(sell_qty, buy_qty)
-                
-                # Calculate profit/loss for this trade
-                trade_pnl = (sell_price - buy_price) * trade_qty
-                
-                if is_paper:
-                    paper_realized += trade_pnl
-                else:
-                    live_realized += trade_pnl
-                
-                realized += trade_pnl
-                
-                # Update quantities
-                sell_qty -= trade_qty
-                buy_order["quantity"] -= trade_qty
-                
-                # Remove buy order if fully consumed
-                if buy_order["quantity"] <= 0:
-                    remaining_buys.pop(0)
-        
-        # Calculate unrealized PnL for remaining positions
-        for buy_order in remaining_buys:
-            if buy_order["quantity"] > 0:
-                try:
-                    # Get current LTP
-                    exchange = buy_order.get("exchange", strategy_exchange)
-                    ltp = _get_ltp_for_symbol(exchange, symbol)
-                    
-                    if ltp > 0:
-                        unrealized_pnl = (ltp - buy_order["price"]) * buy_order["quantity"]
-                        is_paper = buy_order.get("dry_run", True)
-                        
-                        if is_paper:
-                            paper_unrealized += unrealized_pnl
-                        else:
-                            live_unrealized += unrealized_pnl
-                        
-                        unrealized += unrealized_pnl
-                except Exception:
-                    # If we can't get LTP, skip this position
-                    continue
-    
-    return {
+    open_qty, open_cost = store.open_positions()
+    for sid, symbol in enumerate(store.symbols):
+        if not open_qty[sid].any():
+            continue
+        try:
+            ltp = _get_ltp_for_symbol(store.exchanges[sid], symbol)
+        except Exception:
+            # If we can't get LTP, skip this position
+            continue
+        if ltp <= 0:
+            continue
+        paper_u = ltp * float(open_qty[sid, 0]) - float(open_cost[sid, 0])
+        live_u = ltp * float(open_qty[sid, 1]) - float(open_cost[sid, 1])
+        paper_unrealized += paper_u
+        live_unrealized += live_u
+        unrealized += paper_u + live_u
+
+    return ORJSONResponse({
         "realized": round(realized, 2),
         "unrealized": round(unrealized, 2),
         "total": round(realized + unrealized, 2),
@@ -1942,14 +2155,14 @@ def pnl():
             "unrealized": round(live_unrealized, 2),
             "total": round(live_realized + live_unrealized, 2)
         }
-    }
+    })
 
 
 @app.get("/reports/strategy")
 def report_strategy():
     # Aggregate orders by source (strategy) and side pairs
     stats: Dict[str, Dict[str, float]] = {}
-    for o in order_log:
+    for o in list(order_log):
         src = str(o.get("source", "unknown"))
         s = stats.setdefault(src, {"trades": 0, "buy": 0.0, "sell": 0.0, "profit": 0.0})
         s["trades"] += 1
@@ -2025,7 +2238,7 @@ def set_trailing_override(body: TrailingOverrideBody):
 
 # Reports: CSV/PDF for paper vs live
 def _orders_by_mode(is_paper: bool) -> List[dict]:
-    return [o for o in order_log if bool(o.get("dry_run")) == is_paper]
+    return [o for o in list(order_log) if bool(o.get("dry_run")) == is_paper]
 
 
 @app.get("/reports/paper/csv")
@@ -2121,6 +2334,33 @@ def _parse_hhmm(value: str) -> dtime:
         return dtime(hour=9, minute=15)
 
 
+def _next_schedule_event(now: datetime) -> datetime:
+    """Next start/stop boundary after ``now``; tomorrow's first one once both have passed."""
+    start_t = _parse_hhmm(str(schedule_cfg.get("start", "09:15")))
+    stop_t = _parse_hhmm(str(schedule_cfg.get("stop", "15:25")))
+    upcoming = [datetime.combine(now.date(), t, tzinfo=now.tzinfo) for t in (start_t, stop_t)]
+    upcoming = [e for e in upcoming if e > now]
+    if upcoming:
+        return min(upcoming)
+    return datetime.combine(now.date() + timedelta(days=1), min(start_t, stop_t), tzinfo=now.tzinfo)
+
+
+async def _sleep_until_next_schedule_event(tz: ZoneInfo) -> None:
+    now = datetime.now(tz)
+    await asyncio.sleep(max(1.0, (_next_schedule_event(now) - now).total_seconds()))
+
+
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+def _restart_scheduler() -> None:
+    """(Re)start the scheduler task so it sleeps against the current start/stop times."""
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+    _scheduler_task = asyncio.create_task(_scheduler_loop())
+
+
 async def _scheduler_loop():
     tz = ZoneInfo("Asia/Kolkata")
     while True:
@@ -2132,18 +2372,18 @@ async def _scheduler_loop():
                 stop_t = _parse_hhmm(str(schedule_cfg.get("stop", "15:25")))
                 # Weekend / holiday skip
                 if bool(schedule_cfg.get("skip_weekends", True)) and now.weekday() >= 5:
-                    await asyncio.sleep(30)
+                    await _sleep_until_next_schedule_event(tz)
                     continue
                 holidays = schedule_cfg.get("holidays") or []
                 if isinstance(holidays, str):
                     holidays = [x.strip() for x in holidays.split(",") if x.strip()]
                 if today_key in set(holidays):
-                    await asyncio.sleep(30)
+                    await _sleep_until_next_schedule_event(tz)
                     continue
 
                 # START
                 if _schedule_state.get("started_on") != today_key and now.time() >= start_t:
-                    sym = [str(s).upper() for s in (schedule_cfg.get("symbols") or [])]
+                    sym = [_up(str(s)) for s in (schedule_cfg.get("symbols") or [])]
                     # Fallback to AI defaults if no symbols configured
                     if not sym:
                         sym = ai_default_symbols
@@ -2252,7 +2492,7 @@ async def _scheduler_loop():
                     logger.info("Auto-stopped strategy via schedule")
         except Exception:
             logger.exception("Scheduler loop error")
-        await asyncio.sleep(30)
+        await _sleep_until_next_schedule_event(tz)
 
 
 @app.on_event("startup")
@@ -2261,7 +2501,8 @@ async def _startup():
         _load_schedule_from_file()
     except Exception:
         pass
-    asyncio.create_task(_scheduler_loop())
+    _restart_scheduler()
+    asyncio.create_task(_ws_broadcaster())
 
 
 class ScheduleBody(BaseModel):
@@ -2286,13 +2527,13 @@ def get_schedule():
 
 
 @app.post("/schedule")
-def set_schedule(body: ScheduleBody):
+async def set_schedule(body: ScheduleBody):
     schedule_cfg.update({
         "enabled": bool(body.enabled),
         "strategy": body.strategy,
         # allow clients to pass optional strategies list
         "strategies": list(schedule_cfg.get("strategies") or []),
-        "symbols": [s.upper() for s in body.symbols],
+        "symbols": [_up(s) for s in body.symbols],
         "exchange": body.exchange,
         "short": int(body.short),
         "long": int(body.long),
@@ -2305,6 +2546,7 @@ def set_schedule(body: ScheduleBody):
         "options_touch_quantity": int(getattr(body, "options_touch_quantity", schedule_cfg.get("options_touch_quantity", 1)) or 1),
     })
     _save_schedule_to_file()
+    _restart_scheduler()
     logger.info("Schedule updated: %s", schedule_cfg)
     return get_schedule()
 
@@ -2358,31 +2600,25 @@ def squareoff_all():
 _expiries_cache: Dict[str, dict] = {}
 
 
-@app.get("/options/expiries")
-def options_expiries(underlying: str):
+def _options_expiries(underlying: str):
     try:
         global instruments
-        u = (underlying or "").upper()
+        u = _up(underlying or "")
         name_alias = {"SENSEX": "SENSEX", "BSESENSEX": "SENSEX", "NIFTY": "NIFTY", "BANKNIFTY": "NIFTY BANK", "FINNIFTY": "FINNIFTY"}
         u_name = name_alias.get(u, u)
         now_ms = int(time.time() * 1000)
         cached = _expiries_cache.get(u)
         if cached and now_ms - int(cached.get("ts", 0)) < 60 * 60 * 1000:
             return cached.get("data", [])
-        exps = sorted({i.expiry for i in instruments if i.exchange in {"NFO", "BFO"} and (i.name or "").upper() == u_name and i.instrument_type in {"CE", "PE"} and i.expiry})
+        exps = _option_expiries(u_name)
         # If empty, try refreshing instruments from broker
         if not exps and cfg.zerodha_api_key != "demo_key":
             try:
                 data_ins = broker.instruments()
                 if data_ins:
-                    csv_path = Path(cfg.instruments_csv_path)
-                    csv_path.parent.mkdir(parents=True, exist_ok=True)
-                    with csv_path.open("w", newline="", encoding="utf-8") as f:
-                        writer = csv.DictWriter(f, fieldnames=data_ins[0].keys())
-                        writer.writeheader()
-                        writer.writerows(data_ins)
-                    instruments = load_instruments(str(csv_path))
-                    exps = sorted({i.expiry for i in instruments if i.exchange in {"NFO", "BFO"} and (i.name or "").upper() == u and i.instrument_type in {"CE", "PE"} and i.expiry})
+                    instruments = load_instruments(_write_instruments(data_ins))
+                    _rebuild_instrument_indexes()
+                    exps = _option_expiries(u)
             except Exception:
                 logger.exception("refresh instruments for expiries failed")
         data = [e for e in exps if e]
@@ -2393,75 +2629,87 @@ def options_expiries(underlying: str):
         return []
 
 
-@app.get("/options/chain")
-def options_chain(underlying: str, expiry: str, count: int = 10, around: float | None = None):
+def _options_chain(underlying: str, expiry: str, count: int = 10, around: float | None = None):
     try:
         global instruments
-        u = (underlying or "").upper()
+        u = _up(underlying or "")
         # Map index names that differ in instruments 'name'
         name_alias = {"SENSEX": "SENSEX", "NIFTY": "NIFTY", "BANKNIFTY": "NIFTY BANK", "FINNIFTY": "FINNIFTY", "BSESENSEX": "SENSEX"}
         u_name = name_alias.get(u, u)
         exp_param = (expiry or "").strip()
-        items_all = [i for i in instruments if i.exchange in {"NFO", "BFO"} and (i.name or "").upper() == u_name and i.instrument_type in {"CE", "PE"}]
         # support alias 'next' to choose nearest upcoming expiry
         if exp_param.lower() == "next" or exp_param == "":
             try:
                 from datetime import date
                 today = date.today().isoformat()
-                exps = sorted({i.expiry for i in items_all if i.expiry})
-                exp_choice = None
-                for e in exps:
-                    if e >= today:
-                        exp_choice = e
-                        break
-                exp_param = exp_choice or (exps[0] if exps else "")
+                exps = _option_expiries(u_name)
+                # exps is pre-sorted, so the first expiry on/after today is a bisect away
+                j = bisect_left(exps, today)
+                exp_param = (exps[j] if j < len(exps) else exps[0]) if exps else ""
             except Exception:
                 pass
-        items = [i for i in items_all if (i.expiry or "") == exp_param]
+        items = _option_instruments(u_name, exp_param, "CE") + _option_instruments(u_name, exp_param, "PE")
         if not items and cfg.zerodha_api_key != "demo_key":
             # attempt refresh
             try:
                 data_ins = broker.instruments()
                 if data_ins:
-                    csv_path = Path(cfg.instruments_csv_path)
-                    csv_path.parent.mkdir(parents=True, exist_ok=True)
-                    with csv_path.open("w", newline="", encoding="utf-8") as f:
-                        writer = csv.DictWriter(f, fieldnames=data_ins[0].keys())
-                        writer.writeheader()
-                        writer.writerows(data_ins)
-                    instruments = load_instruments(str(csv_path))
-                    items_all = [i for i in instruments if i.exchange in {"NFO", "BFO"} and (i.name or "").upper() == u_name and i.instrument_type in {"CE", "PE"}]
-                    items = [i for i in items_all if (i.expiry or "") == exp_param]
+                    instruments = load_instruments(_write_instruments(data_ins))
+                    _rebuild_instrument_indexes()
+                    items = _option_instruments(u_name, exp_param, "CE") + _option_instruments(u_name, exp_param, "PE")
             except Exception:
                 logger.exception("refresh instruments for chain failed")
             if not items:
                 return {"ce": [], "pe": [], "strikes": []}
-        strikes = sorted(sorted({float(i.strike) for i in items if i.strike}))
-        if not strikes:
+        # np.unique dedups and sorts in one pass
+        strikes = np.unique(np.fromiter((float(i.strike) for i in items if i.strike), dtype=np.float64))
+        if not strikes.size:
             return {"ce": [], "pe": [], "strikes": []}
-        center = around if around and around > 0 else strikes[len(strikes)//2]
-        # take nearest 'count' strikes around center
-        strikes_sorted = sorted(strikes, key=lambda s: abs(s - center))[:max(1, count)]
-        selected = [s for s in sorted(strikes_sorted)]
+        center = around if around and around > 0 else float(strikes[strikes.size // 2])
+        # take nearest 'count' strikes around center: O(n) selection of the k-th distance,
+        # ties at the boundary resolved towards lower strikes
+        d = np.abs(strikes - center)
+        k = min(max(1, count), d.size)
+        kth = np.partition(d, k - 1)[k - 1]
+        inner = np.flatnonzero(d < kth)
+        ties = np.flatnonzero(d == kth)[: k - inner.size]
+        selected = strikes[np.sort(np.concatenate((inner, ties)))].tolist()
+        selected_set = frozenset(selected)
         def pack(kind):
-            arr = []
-            for i in items:
-                if i.instrument_type != kind:
-                    continue
-                if float(i.strike) in selected:
-                    arr.append({
-                        "tradingsymbol": i.tradingsymbol,
-                        "strike": float(i.strike),
-                        "instrument_token": i.instrument_token,
-                        "type": kind,
-                    })
-            return sorted(arr, key=lambda x: x["strike"])[:count]
+            # Bucket contracts by selected strike, then walk `selected` (already ascending)
+            # instead of sorting the packed rows
+            by_strike: Dict[float, list] = {}
+            for i in _option_instruments(u_name, exp_param, kind):
+                strike = float(i.strike)
+                if strike in selected_set:
+                    by_strike.setdefault(strike, []).append(i)
+            return [
+                {
+                    "tradingsymbol": i.tradingsymbol,
+                    "strike": strike,
+                    "instrument_token": i.instrument_token,
+                    "type": kind,
+                }
+                for strike in selected if strike in by_strike
+                for i in by_strike[strike]
+            ][:count]
         return {"ce": pack("CE"), "pe": pack("PE"), "strikes": selected}
     except Exception:
         logger.exception("options chain error")
         return {"ce": [], "pe": [], "strikes": []}
 
 
+# Instrument scans and refreshes block, so the endpoints run them off the event loop
+@app.get("/options/expiries")
+async def options_expiries(underlying: str):
+    return await asyncio.to_thread(_options_expiries, underlying)
+
+
+@app.get("/options/chain")
+async def options_chain(underlying: str, expiry: str, count: int = 10, around: float | None = None):
+    return await asyncio.to_thread(_options_chain, underlying, expiry, count, around)
+
+
 @app.get("/market/status")
 def market_status():
     """Get market status and trading hours"""
@@ -2495,11 +2743,7 @@ def market_status():
 
 @app.get("/status/all")
 def status_all():
-    try:
-        prof = broker.kite.profile()
-        auth = True
-    except Exception:
-        auth = False
+    auth = cfg.zerodha_api_key != "demo_key" and _status_auth_check()[0]
     paper = _paper_equity_and_unrealized()
     return {
         "health": "ok",
@@ -2563,7 +2807,7 @@ class PaperResetBody(BaseModel):
 
 @app.post("/paper/reset")
 def paper_reset(body: PaperResetBody):
-    global paper_account, order_log
+    global paper_account
     try:
         new_cash = float(body.cash) if body.cash is not None else float(paper_account.get("starting_cash", 0.0))
     except Exception:
@@ -2571,7 +2815,8 @@ def paper_reset(body: PaperResetBody):
     paper_account["starting_cash"] = new_cash
     paper_account["cash"] = new_cash
     if bool(body.clear_orders):
-        order_log = [o for o in order_log if not o.get("dry_run")]
+        # In place: the AI engine holds a reference to order_log
+        order_log.drop_paper()
     logger.info("Paper account reset: cash=%.2f clear=%s", new_cash, bool(body.clear_orders))
     return {"cash": round(new_cash, 2), "cleared": bool(body.clear_orders)}
 
@@ -2608,7 +2853,7 @@ class OptionsAtmTradeBody(BaseModel):
 def options_atm_trade(body: OptionsAtmTradeBody):
     """Place ATM straddle/strangle orders for options. If dry_run=True, records paper orders only."""
     try:
-        chain = options_chain(body.underlying, body.expiry, count=max(20, body.count), around=None)
+        chain = _options_chain(body.underlying, body.expiry, count=max(20, body.count), around=None)
         strikes = chain.get("strikes", [])
         ce = chain.get("ce", [])
         pe = chain.get("pe", [])
@@ -2710,10 +2955,9 @@ def ai_start_trading(req: AIStartRequest, background_tasks: BackgroundTasks):
                 "RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK",
                 "KOTAKBANK", "HINDUNILVR", "ITC", "BHARTIARTL", "SBIN"
             ]
-            mapping = resolve_tokens_by_symbols(instruments, syms, exchange="NSE")
+            mapping = resolve_tokens_by_symbols(symbol_index, syms, exchange="NSE")
             if mapping:
-                symbol_to_token.update(mapping)
-                token_to_symbol.update({v: k for k, v in mapping.items()})
+                _index_symbols(mapping)
                 ensure_ticker(mode_full=False)
                 if ticker:
                     try:
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numba import njit
+
+
+# Columns of hold_qty / hold_avg
+HOLD_ALL = 0
+HOLD_MASKED = 1
+
+
+@njit(cache=True)
+def _apply_holding(hold_qty, hold_avg, s, col, signed, p):
+    # Net holdings, weighted average entry on buys
+    new_qty = hold_qty[s, col] + signed
+    if new_qty > 0 and signed > 0:
+        hold_avg[s, col] = (hold_avg[s, col] * hold_qty[s, col] + p * signed) / max(new_qty, 1)
+    hold_qty[s, col] = new_qty
+    if new_qty <= 0:
+        hold_avg[s, col] = 0.0
+
+
+@njit(cache=True)
+def fifo_match(side, qty, price, sym, mask, start, n, lot_rem, lot_next, head, tail,
+               hold_qty, hold_avg, realized):
+    """Apply orders [start, n) to the per-symbol holdings and FIFO lot queues.
+
+    ``hold_qty``/``hold_avg`` are (n_symbols, 2): column HOLD_ALL covers every
+    order, HOLD_MASKED only orders where ``mask`` is set. Each order owns at
+    most one lot (its unmatched remainder), so lots are addressed by order
+    index and chained per symbol through ``lot_next``. ``realized`` is
+    (n_symbols, 2): column 0 masked, column 1 the rest, attributed to the
+    closing order.
+    """
+    for i in range(start, n):
+        s = sym[i]
+        d = side[i]
+        q = qty[i]
+        p = price[i]
+        signed = d * q
+        _apply_holding(hold_qty, hold_avg, s, HOLD_ALL, signed, p)
+        mode = 1
+        if mask[i]:
+            mode = 0
+            _apply_holding(hold_qty, hold_avg, s, HOLD_MASKED, signed, p)
+        # Close opposite-side lots first, then open a lot with the remainder
+        rem = q
+        h = head[s]
+        while rem > 0 and h >= 0 and side[h] != d:
+            m = min(rem, lot_rem[h])
+            realized[s, mode] += (p - price[h]) * m * -d
+            lot_rem[h] -= m
+            rem -= m
+            if lot_rem[h] == 0:
+                h = lot_next[h]
+        head[s] = h
+        if h < 0:
+            tail[s] = -1
+        lot_rem[i] = rem
+        lot_next[i] = -1
+        if rem > 0:
+            if tail[s] >= 0:
+                lot_next[tail[s]] = i
+            else:
+                head[s] = i
+            tail[s] = i
+
+
+@njit(cache=True)
+def open_lots(side, price, paper, lot_rem, lot_next, head, n_syms, open_qty, open_cost):
+    """Sum open lots per symbol into signed quantity and cost, split paper/live."""
+    for s in range(n_syms):
+        h = head[s]
+        while h >= 0:
+            mode = 0 if paper[h] else 1
+            q = side[h] * lot_rem[h]
+            open_qty[s, mode] += q
+            open_cost[s, mode] += q * price[h]
+            h = lot_next[h]
+
+
+class OrderStore:
+    """Mirror of the order log as parallel NumPy arrays (SoA) with interned symbols.
+
+    Holdings and FIFO state are advanced incrementally by ``fifo_match`` over
+    orders appended since the last read. Public methods are thread-safe.
+
+    The store is deliberately unbounded: FIFO matching needs every open lot,
+    so dropping old orders would corrupt holdings and PnL. Each order costs
+    about 42 bytes across the arrays (roughly 42 MB per million orders);
+    only ``reset()`` and ``drop_paper()`` release it.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._lock = threading.RLock()
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self.symbol_id: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.exchanges: List[str] = []
+        self.n = 0
+        self._applied = 0
+        self.side = np.zeros(capacity, dtype=np.int8)
+        self.qty = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.sym = np.zeros(capacity, dtype=np.int64)
+        self.paper = np.zeros(capacity, dtype=np.bool_)
+        self.lot_rem = np.zeros(capacity, dtype=np.int64)
+        self.lot_next = np.full(capacity, -1, dtype=np.int64)
+        self._alloc_symbols(64)
+
+    def _alloc_symbols(self, capacity: int) -> None:
+        n = len(self.symbols)
+
+        def grow(arr, fill):
+            out = np.full((capacity,) + arr.shape[1:], fill, dtype=arr.dtype)
+            out[:n] = arr[:n]
+            return out
+
+        if n == 0:
+            self.head = np.full(capacity, -1, dtype=np.int64)
+            self.tail = np.full(capacity, -1, dtype=np.int64)
+            self.hold_qty = np.zeros((capacity, 2), dtype=np.int64)
+            self.hold_avg = np.zeros((capacity, 2), dtype=np.float64)
+            self.realized = np.zeros((capacity, 2), dtype=np.float64)
+            return
+        self.head = grow(self.head, -1)
+        self.tail = grow(self.tail, -1)
+        self.hold_qty = grow(self.hold_qty, 0)
+        self.hold_avg = grow(self.hold_avg, 0.0)
+        self.realized = grow(self.realized, 0.0)
+
+    def _grow_orders(self) -> None:
+        capacity = self.side.shape[0] * 2
+        for name in ("side", "qty", "price", "sym", "paper", "lot_rem"):
+            arr = getattr(self, name)
+            out = np.zeros(capacity, dtype=arr.dtype)
+            out[: self.n] = arr[: self.n]
+            setattr(self, name, out)
+        out = np.full(capacity, -1, dtype=np.int64)
+        out[: self.n] = self.lot_next[: self.n]
+        self.lot_next = out
+
+    def _intern(self, symbol: str, exchange: Optional[str], default_exchange: str) -> int:
+        # An order without an exchange keeps the symbol's known one, else takes the default
+        sid = self.symbol_id.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            if sid >= self.head.shape[0]:
+                self._alloc_symbols(sid * 2)
+            self.symbol_id[symbol] = sid
+            self.symbols.append(symbol)
+            self.exchanges.append(exchange if exchange is not None else default_exchange)
+        elif exchange is not None:
+            self.exchanges[sid] = exchange
+        return sid
+
+    def append(self, symbol: str, exchange: Optional[str], side: str, quantity: int, price: float, dry_run: bool,
+               default_exchange: str = "NSE") -> None:
+        with self._lock:
+            if self.n >= self.side.shape[0]:
+                self._grow_orders()
+            i = self.n
+            self.sym[i] = self._intern(symbol, exchange, default_exchange)
+            self.side[i] = 1 if side == "BUY" else -1
+            self.qty[i] = int(quantity)
+            self.price[i] = float(price or 0.0)
+            self.paper[i] = bool(dry_run)
+            self.n = i + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset(self.side.shape[0])
+
+    def drop_paper(self) -> None:
+        """Forget paper orders, replaying the live ones so their holdings and PnL survive."""
+        with self._lock:
+            keep = np.flatnonzero(~self.paper[: self.n]).tolist()
+            live = [
+                (self.symbols[self.sym[i]], self.exchanges[self.sym[i]], int(self.side[i]), int(self.qty[i]), float(self.price[i]))
+                for i in keep
+            ]
+            self._reset(self.side.shape[0])
+            for symbol, exchange, side, quantity, price in live:
+                self.append(symbol, exchange, "BUY" if side > 0 else "SELL", quantity, price, False)
+
+    def _update(self) -> None:
+        if self._applied < self.n:
+            # Mask is the paper flag: masked holdings are paper-only, realized splits paper/live
+            fifo_match(
+                self.side, self.qty, self.price, self.sym, self.paper, self._applied, self.n,
+                self.lot_rem, self.lot_next, self.head, self.tail,
+                self.hold_qty, self.hold_avg, self.realized,
+            )
+            self._applied = self.n
+
+    def holdings(self, paper_only: bool = False) -> Dict[str, dict]:
+        with self._lock:
+            self._update()
+            col = HOLD_MASKED if paper_only else HOLD_ALL
+            qty = self.hold_qty[:, col]
+            avg = self.hold_avg[:, col]
+            out: Dict[str, dict] = {}
+            for sid, sym in enumerate(self.symbols):
+                out[sym] = {"quantity": int(qty[sid]), "avg_price": float(avg[sid]), "exchange": self.exchanges[sid]}
+            return out
+
+    def realized_by_mode(self) -> Tuple[float, float]:
+        """Return realized PnL as (paper, live)."""
+        with self._lock:
+            self._update()
+            n_syms = len(self.symbols)
+            return float(self.realized[:n_syms, 0].sum()), float(self.realized[:n_syms, 1].sum())
+
+    def open_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (open_qty, open_cost), each (n_symbols, 2) split paper/live."""
+        with self._lock:
+            self._update()
+            n_syms = len(self.symbols)
+            open_qty = np.zeros((n_syms, 2), dtype=np.int64)
+            open_cost = np.zeros((n_syms, 2), dtype=np.float64)
+            open_lots(self.side, self.price, self.paper, self.lot_rem, self.lot_next, self.head, n_syms, open_qty, open_cost)
+            return open_qty, open_cost
+
+
+class OrderLog(deque):
+    """Bounded order log (oldest entries roll off) that feeds every append into an OrderStore.
+
+    The store keeps the full history, so holdings and PnL stay correct after
+    entries fall out of the log. ``clear()`` resets the store as well.
+    Orders without an ``exchange`` are filed under ``default_exchange()``.
+    """
+
+    def __init__(self, store: OrderStore, maxlen: int = 50000,
+                 default_exchange: Callable[[], str] = lambda: "NSE") -> None:
+        super().__init__(maxlen=maxlen)
+        self.store = store
+        self.default_exchange = default_exchange
+
+    def append(self, order: dict) -> None:
+        self.store.append(
+            order["symbol"],
+            order.get("exchange"),
+            order["side"],
+            order["quantity"],
+            order["price"],
+            order.get("dry_run", True),
+            self.default_exchange(),
+        )
+        super().append(order)
+
+    def extend(self, orders: Iterable[dict]) -> None:
+        for o in orders:
+            self.append(o)
+
+    def clear(self) -> None:
+        super().clear()
+        self.store.reset()
+
+    def drop_paper(self) -> None:
+        """Remove paper orders from the log and the store; live history, including
+        orders already rolled off the log, stays in the store."""
+        live = [o for o in self if not o.get("dry_run", True)]
+        super().clear()
+        super().extend(live)
+        self.store.drop_paper()
+
+    def tail(self, count: int) -> List[dict]:
+        """Last ``count`` orders, oldest first, without walking the whole log."""
+        return [self[i] for i in range(-min(count, len(self)), 0)]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def ema_path(prev, prices, k):
+    """EMA after each of ``prices`` starting from ``prev``, by the sequential recurrence.
+
+    Kept step-by-step (no fastmath, no closed form) so a flat price series
+    leaves the EMA exactly on the price and crossovers never flip on
+    rounding noise. ``k`` >= 1 (period <= 1) tracks the price itself.
+    """
+    out = np.empty_like(prices)
+    e = prev
+    for j in range(prices.size):
+        p = prices[j]
+        e = p if k >= 1.0 else (p - e) * k + e
+        out[j] = e
+    return out
+
+
+@njit(cache=True)
+def ema_update(ema, ids, prices, k):
+    """One EMA step per symbol: advance ``ema[ids[j]]`` by ``prices[j]`` in place.
+
+    ``ids`` must be distinct. Returns the updated values in ``ids`` order.
+    """
+    out = np.empty_like(prices)
+    for j in range(ids.size):
+        i = ids[j]
+        p = prices[j]
+        e = p if k >= 1.0 else (p - ema[i]) * k + ema[i]
+        ema[i] = e
+        out[j] = e
+    return out
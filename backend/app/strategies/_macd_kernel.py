@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from numba import njit
+
+# Per-symbol init state for macd_step
+STATE_NEW = 0
+STATE_EMAS = 1
+STATE_READY = 2
+
+
+@njit(cache=True, fastmath=True)
+def macd_step(sym, prices, ema_f, ema_s, ema_sig, state, last_macd, last_signal, last_side,
+              k_f, k_s, k_sig, cross):
+    """Advance per-symbol MACD state over a batch of (symbol id, price) in arrival order.
+
+    State arrays are indexed by symbol id and updated in place. ``state`` is
+    STATE_NEW, STATE_EMAS (fast/slow EMAs seeded) or STATE_READY (signal EMA
+    seeded too), so each price takes exactly one init-or-update path. ``cross[j]`` is
+    set to +1 (bullish) / -1 (bearish) when price ``j`` produces a crossover
+    signal, else 0.
+    """
+    for j in range(prices.size):
+        i = sym[j]
+        p = prices[j]
+        st = state[i]
+        if st == STATE_READY:
+            ema_f[i] += k_f * (p - ema_f[i])
+            ema_s[i] += k_s * (p - ema_s[i])
+            macd = ema_f[i] - ema_s[i]
+            ema_sig[i] += k_sig * (macd - ema_sig[i])
+            signal = ema_sig[i]
+        elif st == STATE_EMAS:
+            ema_f[i] += k_f * (p - ema_f[i])
+            ema_s[i] += k_s * (p - ema_s[i])
+            macd = ema_f[i] - ema_s[i]
+            # Signal line is the EMA of the MACD line, seeded by its first value
+            ema_sig[i] = macd
+            signal = macd
+            state[i] = STATE_READY
+        else:
+            # Initialize EMAs with first price
+            ema_f[i] = p
+            ema_s[i] = p
+            macd = 0.0
+            signal = 0.0
+            state[i] = STATE_EMAS
+        c = 0
+        lm = last_macd[i]
+        ls = last_signal[i]
+        if lm != 0.0 and ls != 0.0:
+            if lm <= ls and macd > signal and last_side[i] != 1:
+                c = 1
+            elif lm >= ls and macd < signal and last_side[i] != -1:
+                c = -1
+        if c != 0:
+            last_side[i] = c
+        cross[j] = c
+        last_macd[i] = macd
+        last_signal[i] = signal
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from numba import njit
+
+
+@njit(cache=True)
+def rsi_step(sym, prices, avg_gain, avg_loss, prev_price, n_seen, last_rsi, last_side,
+             period, oversold, overbought, cross):
+    """Advance per-symbol Wilder RSI state over a batch of (symbol id, price) in arrival order.
+
+    State arrays are indexed by symbol id and updated in place. ``avg_gain`` /
+    ``avg_loss`` hold plain sums until ``period`` changes are seen, then
+    Wilder's smoothed averages. ``cross[j]`` is set to +1 (oversold BUY) /
+    -1 (overbought SELL) when price ``j`` produces a signal, else 0.
+    """
+    for j in range(prices.size):
+        i = sym[j]
+        p = prices[j]
+        seen = n_seen[i] + 1
+        n_seen[i] = seen
+        prev = prev_price[i]
+        prev_price[i] = p
+        rsi = 50.0  # Neutral RSI until the initial averages exist
+        if seen > 1:
+            change = p - prev
+            # max() lowers to maxsd, so the ~50/50 up/down split costs no mispredicted branches
+            gain = max(change, 0.0)
+            loss = max(-change, 0.0)
+            if seen <= period:
+                # Accumulate the first `period` changes for the initial averages
+                avg_gain[i] += gain
+                avg_loss[i] += loss
+            else:
+                if seen == period + 1:
+                    # Calculate initial averages
+                    ag = (avg_gain[i] + gain) / period
+                    al = (avg_loss[i] + loss) / period
+                else:
+                    # Apply Wilder's smoothing
+                    ag = (avg_gain[i] * (period - 1) + gain) / period
+                    al = (avg_loss[i] * (period - 1) + loss) / period
+                avg_gain[i] = ag
+                avg_loss[i] = al
+                if al == 0:
+                    rsi = 100.0
+                else:
+                    rsi = 100 - (100 / (1 + ag / al))
+        last_rsi[i] = rsi
+        c = 0
+        if rsi < oversold and last_side[i] != 1:
+            c = 1
+            last_side[i] = 1
+        elif rsi > overbought and last_side[i] != -1:
+            c = -1
+            last_side[i] = -1
+        elif oversold < rsi < overbought:
+            # Reset signal when RSI returns to neutral zone
+            last_side[i] = 0
+        cross[j] = c
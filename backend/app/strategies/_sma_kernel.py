@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from numba import njit
+
+
+@njit(cache=True)
+def _window_sum(buf, i, pos, length):
+    # Sum of the last `length` values written to row i of the ring buffer, oldest first
+    size = buf.shape[1]
+    total = 0.0
+    for k in range(length, 0, -1):
+        total += buf[i, (pos - k + size) % size]
+    return total
+
+
+@njit(cache=True)
+def sma_step(sym, prices, buf, pos, count, sum_s, sum_l, evictions, prev_close, last_side,
+             short_window, long_window, touch, resync_every, tie_eps, touch_tol, cross):
+    """Advance per-symbol SMA crossover state over a batch of (symbol id, price) in arrival order.
+
+    ``buf`` is an (n_symbols, max(short_window, long_window)) ring buffer with
+    write pointer ``pos`` and fill ``count``; ``sum_s`` / ``sum_l`` are the
+    running sums over the short / long windows, recomputed from the buffer
+    every ``resync_every`` evictions to shed float drift. ``touch`` enables
+    the 21-SMA touch entry rule; a short SMA within ``touch_tol`` (relative)
+    of the touch bounds is re-summed from the window so drift cannot flip an
+    exact touch. ``cross[j]`` is set to +1 (BUY) / -1 (SELL)
+    when price ``j`` flips the symbol's side, else 0.
+    """
+    size = buf.shape[1]
+    for j in range(prices.size):
+        i = sym[j]
+        p = prices[j]
+        n = count[i]
+        w = pos[i]
+        # Drop the value leaving each window before it is overwritten
+        if n >= short_window:
+            sum_s[i] -= buf[i, (w - short_window + size) % size]
+        if n >= long_window:
+            sum_l[i] -= buf[i, (w - long_window + size) % size]
+        if n == size:
+            evictions[i] += 1
+        else:
+            n += 1
+            count[i] = n
+        buf[i, w] = p
+        w = (w + 1) % size
+        pos[i] = w
+        if evictions[i] >= resync_every:
+            evictions[i] = 0
+            sum_s[i] = _window_sum(buf, i, w, min(n, short_window))
+            sum_l[i] = _window_sum(buf, i, w, min(n, long_window))
+        else:
+            sum_s[i] += p
+            sum_l[i] += p
+        cross[j] = 0
+        if n < short_window or n < long_window:
+            continue
+        sma_s = sum_s[i] / short_window
+        sma_l = sum_l[i] / long_window
+        side = 0
+        if touch:
+            # Define candle color by last traded price vs previous close snapshot
+            prev_c = prev_close[i]
+            candle_green = p >= prev_c
+            lo = prev_c if candle_green else p
+            hi = p if candle_green else prev_c
+            tol = touch_tol * abs(sma_s)
+            if lo - tol <= sma_s <= hi + tol:
+                sma_s = _window_sum(buf, i, w, short_window) / short_window
+            # Touch detected if price crosses from below to above SMA, or above to below
+            if candle_green and prev_c <= sma_s <= p:
+                side = 1
+            elif (not candle_green) and prev_c >= sma_s >= p:
+                side = -1
+            prev_close[i] = p
+        if side == 0:
+            # Differences within float noise of the running sums count as a tie (SELL)
+            side = 1 if sma_s - sma_l > tie_eps * abs(sma_l) else -1
+        if side != last_side[i]:
+            cross[j] = side
+            last_side[i] = side
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Signal:
     symbol: str
     side: str  # BUY or SELL
@@ -12,12 +14,107 @@ class Signal:
 
 
 class BaseStrategy:
+    # True when the strategy implements on_batch, so callers can skip building tick dicts
+    BATCHED = False
+
     def __init__(self, symbols: Iterable[str]) -> None:
         self.symbols = [s.upper() for s in symbols]
+        # Symbol -> row in the per-symbol state arrays (SoA) kept by subclasses
+        self._idx: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
 
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         raise NotImplementedError
 
+    def on_batch(self, rows: np.ndarray, prices: np.ndarray) -> List[Signal]:
+        """Advance state over (row, price) pairs in arrival order.
+
+        ``rows`` (int64) index ``self.symbols`` and ``prices`` are float64, as
+        returned by ``batch_arrays``. Only strategies with BATCHED set implement it.
+        """
+        raise NotImplementedError
+
+    def batch_arrays(self, symbols: Iterable[Optional[str]], prices: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and float64 prices for the ticks of this strategy's symbols, in arrival order."""
+        sym_to_idx = self._idx
+        rows: List[int] = []
+        px: List[float] = []
+        for symbol, price in zip(symbols, prices):
+            i = sym_to_idx.get(symbol)
+            if i is None or price is None:
+                continue
+            rows.append(i)
+            px.append(price)
+        return np.asarray(rows, dtype=np.int64), np.asarray(px, dtype=np.float64)
+
+
+def tick_price(tick: dict):
+    """Last traded price of a raw tick, whichever key the feed used.
+
+    MarketTicker stores this as ``_px`` on every tick before dispatch, so
+    strategies read a single key.
+    """
+    return tick.get("last_price") or tick.get("last_traded_price") or tick.get("ltp")
+
+
+def bucket_ticks(ticks: List[dict]) -> Dict[str, np.ndarray]:
+    """Group tick prices per ``_symbol`` (arrival order kept) as float64 arrays."""
+    buckets: Dict[str, list] = {}
+    for t in ticks:
+        symbol = t.get("_symbol")
+        price = t.get("_px")
+        if not symbol or price is None:
+            continue
+        buckets.setdefault(symbol, []).append(price)
+    return {s: np.asarray(p, dtype=np.float64) for s, p in buckets.items()}
+
+
+class PriceBook:
+    """Per-symbol ring buffers of recent prices as parallel NumPy arrays (SoA).
+
+    Row ``i`` of ``buf`` holds the last ``window`` entries of the strategy's
+    symbol ``i``; ``pos`` is each row's next write slot and ``count`` its fill.
+    With ``width`` > 1 every entry is that many values (e.g. high and low).
+    Compiled kernels can take the three arrays directly.
+    """
+
+    __slots__ = ("buf", "pos", "count")
+
+    def __init__(self, n_symbols: int, window: int, width: int = 1) -> None:
+        shape = (n_symbols, window) if width == 1 else (n_symbols, window, width)
+        self.buf = np.zeros(shape, dtype=np.float64)
+        self.pos = np.zeros(n_symbols, dtype=np.int64)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+
+    @property
+    def window(self) -> int:
+        return self.buf.shape[1]
+
+    def append(self, i: int, value):
+        """Write ``value`` into row ``i``; return the entry it overwrote, or None while the row fills."""
+        size = self.buf.shape[1]
+        w = int(self.pos[i])
+        old = None
+        if self.count[i] == size:
+            old = self.buf[i, w].copy()
+        else:
+            self.count[i] += 1
+        self.buf[i, w] = value
+        self.pos[i] = w + 1 if w + 1 < size else 0
+        return old
+
+    def values(self, i: int) -> np.ndarray:
+        """Entries of row ``i``, oldest first (a view until the row wraps)."""
+        n = int(self.count[i])
+        row = self.buf[i]
+        if n < row.shape[0]:
+            return row[:n]
+        w = int(self.pos[i])
+        return np.concatenate((row[w:], row[:w]))
+
+
+def ema_alpha(period: int) -> float:
+    return 1.0 if period <= 1 else 2.0 / (period + 1.0)
+
 
 
 
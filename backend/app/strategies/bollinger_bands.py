@@ -1,10 +1,24 @@
 from __future__ import annotations
 
-import collections
 import math
-from typing import Deque, Dict, Iterable, List
+from typing import Iterable, List
 
-from .base import BaseStrategy, Signal
+import numpy as np
+from numba import njit
+
+from .base import BaseStrategy, PriceBook, Signal, bucket_ticks
+
+
+@njit("Tuple((f8, f8, f8))(f8, f8, i8, f8)", cache=True)
+def _bb(sum_, sum_sq, n, std_mult):
+    """Bollinger Bands (upper, middle, lower) from a window's running sum and sum of squares."""
+    mean = sum_ / n
+    # Population variance, clamped against rounding below zero
+    var = sum_sq / n - mean * mean
+    if var < 0.0:
+        var = 0.0
+    std = math.sqrt(var)
+    return mean + std_mult * std, mean, mean - std_mult * std
 
 
 class BollingerBandsStrategy(BaseStrategy):
@@ -12,6 +26,9 @@ class BollingerBandsStrategy(BaseStrategy):
     Bollinger Bands strategy for both equity and options trading
     Buy when price touches lower band, Sell when price touches upper band
     """
+
+    # Recompute the running sums from the window this often to shed float drift
+    RESYNC_EVERY = 1000
     
     def __init__(self, symbols: Iterable[str], period: int = 20, 
                  std_dev: float = 2.0, quantity: int = 1) -> None:
@@ -19,64 +36,78 @@ class BollingerBandsStrategy(BaseStrategy):
         self.period = period
         self.std_dev = std_dev
         self.quantity = quantity
-        self.price_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=period) for s in self.symbols
-        }
-        self.last_signal_side: Dict[str, str] = {s: "" for s in self.symbols}
-        
-    def _calculate_bollinger_bands(self, prices: Deque[float]) -> tuple[float, float, float]:
-        """Calculate Bollinger Bands (upper, middle, lower)"""
-        if len(prices) < self.period:
-            return 0.0, 0.0, 0.0
-        
-        price_list = list(prices)
-        
-        # Calculate SMA (middle band)
-        sma = sum(price_list) / len(price_list)
-        
-        # Calculate standard deviation
-        variance = sum((price - sma) ** 2 for price in price_list) / len(price_list)
-        std = math.sqrt(variance)
-        
-        # Calculate upper and lower bands
-        upper_band = sma + (self.std_dev * std)
-        lower_band = sma - (self.std_dev * std)
-        
-        return upper_band, sma, lower_band
-    
+        n = len(self.symbols)
+        self._book = PriceBook(n, period)
+        self._last_side = np.zeros(n, dtype=np.int8)  # 1 BUY, -1 SELL, 0 none
+        # Running sum / sum of squares over the window, so each tick is O(1)
+        self._sum = np.zeros(n, dtype=np.float64)
+        self._sum_sq = np.zeros(n, dtype=np.float64)
+        self._evictions = np.zeros(n, dtype=np.int64)
+
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         signals: List[Signal] = []
+        _Signal = Signal
+        period = self.period
+        std_dev = float(self.std_dev)
+        resync_every = self.RESYNC_EVERY
+        quantity = self.quantity
+        book = self._book
         
-        for tick in ticks:
-            symbol = tick.get("_symbol", "")
-            price = tick.get("last_price") or tick.get("last_traded_price") or tick.get("ltp")
-            
-            if not symbol or price is None:
+        # Bucket per symbol first; the running-sum update below is already O(1) per price
+        for symbol, prices in bucket_ticks(ticks).items():
+            i = self._idx.get(symbol)
+            if i is None:
                 continue
+            # Per-symbol state is read into locals once and written back after its prices;
+            # the ring buffer slot arithmetic is inlined here rather than going through PriceBook.append
+            window = book.buf[i]
+            w = int(book.pos[i])
+            n = int(book.count[i])
+            total = float(self._sum[i])
+            total_sq = float(self._sum_sq[i])
+            evictions = int(self._evictions[i])
+            last_side = int(self._last_side[i])
+            for price in prices.tolist():
+                # Update price history, keeping the running sums in step
+                if n == period:
+                    old = float(window[w])
+                    total -= old
+                    total_sq -= old * old
+                    evictions += 1
+                else:
+                    n += 1
+                window[w] = price
+                w = w + 1 if w + 1 < period else 0
+                if evictions >= resync_every:
+                    evictions = 0
+                    values = window[:n].tolist()
+                    total = math.fsum(values)
+                    total_sq = math.fsum(p * p for p in values)
+                else:
+                    total += price
+                    total_sq += price * price
                 
-            price = float(price)
-            
-            if symbol not in self.price_history:
-                continue
+                if n < period:  # Not enough data
+                    continue
                 
-            # Update price history
-            self.price_history[symbol].append(price)
-            
-            # Calculate Bollinger Bands
-            upper_band, middle_band, lower_band = self._calculate_bollinger_bands(self.price_history[symbol])
-            
-            if upper_band == 0.0:  # Not enough data
-                continue
-            
-            # Generate signals based on Bollinger Bands
-            if price <= lower_band and self.last_signal_side[symbol] != "BUY":
-                signals.append(Signal(symbol=symbol, side="BUY", quantity=self.quantity))
-                self.last_signal_side[symbol] = "BUY"
-            elif price >= upper_band and self.last_signal_side[symbol] != "SELL":
-                signals.append(Signal(symbol=symbol, side="SELL", quantity=self.quantity))
-                self.last_signal_side[symbol] = "SELL"
-            elif lower_band < price < upper_band:
-                # Reset signal when price returns to middle range
-                self.last_signal_side[symbol] = ""
+                # Calculate Bollinger Bands
+                upper_band, _, lower_band = _bb(total, total_sq, n, std_dev)
+                
+                # Generate signals based on Bollinger Bands
+                if price <= lower_band and last_side != 1:
+                    signals.append(_Signal(symbol, "BUY", quantity))
+                    last_side = 1
+                elif price >= upper_band and last_side != -1:
+                    signals.append(_Signal(symbol, "SELL", quantity))
+                    last_side = -1
+                elif lower_band < price < upper_band:
+                    # Reset signal when price returns to middle range
+                    last_side = 0
+            book.pos[i] = w
+            book.count[i] = n
+            self._sum[i] = total
+            self._sum_sq[i] = total_sq
+            self._evictions[i] = evictions
+            self._last_side[i] = last_side
         
         return signals
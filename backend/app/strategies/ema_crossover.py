@@ -1,16 +1,11 @@
 from __future__ import annotations
 
-import collections
-from typing import Deque, Dict, Iterable, List
+from typing import Iterable, List
 
-from .base import BaseStrategy, Signal
+import numpy as np
 
-
-def _ema(prev: float, price: float, period: int) -> float:
-    if period <= 1:
-        return price
-    k = 2.0 / (period + 1.0)
-    return (price - prev) * k + prev
+from ._ema_kernel import ema_path, ema_update
+from .base import BaseStrategy, Signal, bucket_ticks, ema_alpha
 
 
 class EmaCrossoverStrategy(BaseStrategy):
@@ -18,32 +13,71 @@ class EmaCrossoverStrategy(BaseStrategy):
         super().__init__(symbols)
         self.short_window = short_window
         self.long_window = long_window
-        self.ema_s: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.ema_l: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.seeded: Dict[str, bool] = {s: False for s in self.symbols}
-        self.last_signal_side: Dict[str, str] = {s: "" for s in self.symbols}
+        self._k_s = ema_alpha(short_window)
+        self._k_l = ema_alpha(long_window)
+        n = len(self.symbols)
+        self._ema_s = np.zeros(n, dtype=np.float64)
+        self._ema_l = np.zeros(n, dtype=np.float64)
+        self._seeded = np.zeros(n, dtype=np.bool_)
+        self._last_side = np.zeros(n, dtype=np.int8)  # 1 BUY, -1 SELL, 0 none
 
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         signals: List[Signal] = []
-        for t in ticks:
-            symbol = t.get("_symbol")
-            price = t.get("last_price") or t.get("last_traded_price") or t.get("ltp")
-            if not symbol or price is None:
+        _Signal = Signal
+        # Hoist attribute lookups out of the per-symbol loop
+        idx = self._idx
+        ema_s = self._ema_s
+        ema_l = self._ema_l
+        seeded = self._seeded
+        last_side = self._last_side
+        k_s = self._k_s
+        k_l = self._k_l
+        # Symbols with a single price this batch (the common case) are stepped together below
+        one_ids: List[int] = []
+        one_px: List[float] = []
+        one_syms: List[str] = []
+        # One compiled EMA pass per symbol over all of its prices in this batch
+        for symbol, prices in bucket_ticks(ticks).items():
+            i = idx.get(symbol)
+            if i is None:
                 continue
-            price = float(price)
-            if not self.seeded[symbol]:
-                self.ema_s[symbol] = price
-                self.ema_l[symbol] = price
-                self.seeded[symbol] = True
+            if not seeded[i]:
+                ema_s[i] = prices[0]
+                ema_l[i] = prices[0]
+                seeded[i] = True
+                prices = prices[1:]
+                if not prices.size:
+                    continue
+            if prices.size == 1:
+                one_ids.append(i)
+                one_px.append(prices[0])
+                one_syms.append(symbol)
                 continue
-            self.ema_s[symbol] = _ema(self.ema_s[symbol], price, self.short_window)
-            self.ema_l[symbol] = _ema(self.ema_l[symbol], price, self.long_window)
-            side = "BUY" if self.ema_s[symbol] > self.ema_l[symbol] else "SELL"
-            if side != self.last_signal_side[symbol]:
-                signals.append(Signal(symbol=symbol, side=side, quantity=1))
-                self.last_signal_side[symbol] = side
+            es = ema_path(ema_s[i], prices, k_s)
+            el = ema_path(ema_l[i], prices, k_l)
+            ema_s[i] = es[-1]
+            ema_l[i] = el[-1]
+            # +1 BUY / -1 SELL after each price; a signal fires wherever the side changes
+            sides = _sides(es, el)
+            flips = np.flatnonzero(np.diff(sides, prepend=last_side[i]))
+            signals.extend([_Signal(symbol, "BUY" if c > 0 else "SELL", 1) for c in sides[flips].tolist()])
+            last_side[i] = sides[-1]
+        if one_ids:
+            # One EMA step for every single-price symbol at once, flips found with a mask
+            ids = np.asarray(one_ids, dtype=np.intp)
+            px = np.asarray(one_px, dtype=np.float64)
+            es = ema_update(ema_s, ids, px, k_s)
+            el = ema_update(ema_l, ids, px, k_l)
+            new_side = _sides(es, el)
+            flips = np.flatnonzero(new_side != last_side[ids])
+            signals.extend([
+                _Signal(one_syms[j], "BUY" if c > 0 else "SELL", 1)
+                for j, c in zip(flips.tolist(), new_side[flips].tolist())
+            ])
+            last_side[ids] = new_side
         return signals
 
 
-
-
+def _sides(ema_short: np.ndarray, ema_long: np.ndarray) -> np.ndarray:
+    """Branchless int8 side per element: +1 BUY when the short EMA is above, else -1 SELL."""
+    return (ema_short > ema_long).astype(np.int8) * np.int8(2) - np.int8(1)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import collections
-from typing import Deque, Dict, Iterable, List
+from typing import Iterable, List
 
-from .base import BaseStrategy, Signal
+import numpy as np
+
+from ._macd_kernel import macd_step
+from .base import BaseStrategy, Signal, ema_alpha
 
 
 class MacdStrategy(BaseStrategy):
@@ -12,6 +14,8 @@ class MacdStrategy(BaseStrategy):
     Buy when MACD line crosses above signal line, Sell when it crosses below
     """
     
+    BATCHED = True
+    
     def __init__(self, symbols: Iterable[str], fast_period: int = 12, 
                  slow_period: int = 26, signal_period: int = 9,
                  quantity: int = 1) -> None:
@@ -20,96 +24,42 @@ class MacdStrategy(BaseStrategy):
         self.slow_period = slow_period
         self.signal_period = signal_period
         self.quantity = quantity
-        self.price_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=slow_period + signal_period) for s in self.symbols
-        }
-        self.ema_fast: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.ema_slow: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.ema_signal: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.macd_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=signal_period) for s in self.symbols
-        }
-        self.last_macd: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.last_signal: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.last_signal_side: Dict[str, str] = {s: "" for s in self.symbols}
-        self.initialized: Dict[str, bool] = {s: False for s in self.symbols}
-        
-    def _calculate_ema(self, prev_ema: float, price: float, period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if period <= 1:
-            return price
-        k = 2.0 / (period + 1.0)
-        return (price - prev_ema) * k + prev_ema
-    
-    def _calculate_macd(self, symbol: str, price: float) -> tuple[float, float, float]:
-        """Calculate MACD (macd_line, signal_line, histogram)"""
-        # Initialize EMAs with first price
-        if not self.initialized[symbol]:
-            self.ema_fast[symbol] = price
-            self.ema_slow[symbol] = price
-            self.initialized[symbol] = True
-            return 0.0, 0.0, 0.0
-        
-        # Update EMAs
-        self.ema_fast[symbol] = self._calculate_ema(self.ema_fast[symbol], price, self.fast_period)
-        self.ema_slow[symbol] = self._calculate_ema(self.ema_slow[symbol], price, self.slow_period)
-        
-        # Calculate MACD line
-        macd_line = self.ema_fast[symbol] - self.ema_slow[symbol]
-        
-        # Update MACD history for signal line calculation
-        self.macd_history[symbol].append(macd_line)
-        
-        # Calculate signal line (EMA of MACD line)
-        if len(self.macd_history[symbol]) == 1:
-            self.ema_signal[symbol] = macd_line
-        else:
-            self.ema_signal[symbol] = self._calculate_ema(self.ema_signal[symbol], macd_line, self.signal_period)
-        
-        # Calculate histogram
-        histogram = macd_line - self.ema_signal[symbol]
-        
-        return macd_line, self.ema_signal[symbol], histogram
+        self._k_f = ema_alpha(fast_period)
+        self._k_s = ema_alpha(slow_period)
+        self._k_sig = ema_alpha(signal_period)
+        # Per-symbol state as parallel arrays (SoA) indexed by symbol id, advanced by macd_step
+        n = len(self.symbols)
+        self._ema_f = np.zeros(n, dtype=np.float64)
+        self._ema_s = np.zeros(n, dtype=np.float64)
+        self._ema_sig = np.zeros(n, dtype=np.float64)
+        self._state = np.zeros(n, dtype=np.int8)  # STATE_NEW / STATE_EMAS / STATE_READY
+        self._last_macd = np.zeros(n, dtype=np.float64)
+        self._last_signal = np.zeros(n, dtype=np.float64)
+        self._last_side = np.zeros(n, dtype=np.int8)  # 1 BUY, -1 SELL, 0 none
     
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
-        signals: List[Signal] = []
-        
-        for tick in ticks:
-            symbol = tick.get("_symbol", "")
-            price = tick.get("last_price") or tick.get("last_traded_price") or tick.get("ltp")
-            
-            if not symbol or price is None:
-                continue
-                
-            price = float(price)
-            
-            if symbol not in self.price_history:
-                continue
-                
-            # Update price history
-            self.price_history[symbol].append(price)
-            
-            # Calculate MACD
-            macd_line, signal_line, histogram = self._calculate_macd(symbol, price)
-            
-            # Generate signals based on MACD crossover
-            if self.last_macd[symbol] != 0.0 and self.last_signal[symbol] != 0.0:
-                # Bullish crossover: MACD crosses above signal line
-                if (self.last_macd[symbol] <= self.last_signal[symbol] and 
-                    macd_line > signal_line and 
-                    self.last_signal_side[symbol] != "BUY"):
-                    signals.append(Signal(symbol=symbol, side="BUY", quantity=self.quantity))
-                    self.last_signal_side[symbol] = "BUY"
-                
-                # Bearish crossover: MACD crosses below signal line
-                elif (self.last_macd[symbol] >= self.last_signal[symbol] and 
-                      macd_line < signal_line and 
-                      self.last_signal_side[symbol] != "SELL"):
-                    signals.append(Signal(symbol=symbol, side="SELL", quantity=self.quantity))
-                    self.last_signal_side[symbol] = "SELL"
-            
-            # Update last values
-            self.last_macd[symbol] = macd_line
-            self.last_signal[symbol] = signal_line
+        return self.on_batch(*self.batch_arrays(
+            [t.get("_symbol", "") for t in ticks], [t.get("_px") for t in ticks]
+        ))
+
+    def on_batch(self, rows: np.ndarray, prices: np.ndarray) -> List[Signal]:
+        if rows.size == 0:
+            return []
+        _Signal = Signal
         
-        return signals
+        # Run the whole batch through the compiled kernel in arrival order
+        cross = np.zeros(rows.size, dtype=np.int8)
+        macd_step(
+            rows, prices,
+            self._ema_f, self._ema_s, self._ema_sig, self._state,
+            self._last_macd, self._last_signal, self._last_side,
+            self._k_f, self._k_s, self._k_sig, cross,
+        )
+        # Crossovers are known up front, so the signal list is built at its final size
+        flips = np.flatnonzero(cross)
+        symbols = self.symbols
+        quantity = self.quantity
+        return [
+            _Signal(symbols[i], "BUY" if c > 0 else "SELL", quantity)
+            for i, c in zip(rows[flips].tolist(), cross[flips].tolist())
+        ]
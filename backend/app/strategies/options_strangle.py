@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import collections
+import itertools
 import math
-from typing import Dict, Iterable, List, Optional
+from typing import DefaultDict, Deque, Dict, Iterable, List, Optional
+
+import numpy as np
 
 from .base import BaseStrategy, Signal
 
@@ -23,26 +27,36 @@ class OptionsStrangleStrategy(BaseStrategy):
         self.volatility_threshold = volatility_threshold
         self.otm_offset = otm_offset  # How many strikes OTM
         self.positions: Dict[str, Dict] = {}
-        self.price_history: Dict[str, List[float]] = {s: [] for s in self.symbols}
+        # Bounded windows: 50 prices for the underlying, 20 for option legs (allocated on first tick)
+        self.price_history: DefaultDict[str, Deque[float]] = collections.defaultdict(
+            lambda: collections.deque(maxlen=20)
+        )
+        self.price_history[self.underlying] = collections.deque(maxlen=50)
         self.last_underlying_price: Optional[float] = None
+        # Bumped whenever the underlying window changes; the volatility cache is keyed on it
+        self._vol_tick_id = 0
+        self._vol_cache: tuple[int, float] = (-1, 0.0)
         
-    def _calculate_volatility(self, prices: List[float], period: int = 20) -> float:
+    def _calculate_volatility(self, prices: Deque[float], period: int = 20) -> float:
         """Calculate historical volatility"""
         if len(prices) < period:
             return 0.0
         
-        recent_prices = prices[-period:]
-        returns = []
-        for i in range(1, len(recent_prices)):
-            if recent_prices[i-1] > 0:
-                returns.append(math.log(recent_prices[i] / recent_prices[i-1]))
+        recent = np.fromiter(itertools.islice(prices, len(prices) - period, None), dtype=np.float64, count=period)
+        # Log returns, skipping steps from a non-positive price
+        valid = recent[:-1] > 0
+        returns = np.log(recent[1:][valid] / recent[:-1][valid])
         
-        if len(returns) < 2:
+        if returns.size < 2:
             return 0.0
             
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-        return math.sqrt(variance * 252)  # Annualized volatility
+        return math.sqrt(float(returns.var(ddof=1)) * 252)  # Annualized volatility
+    
+    def _underlying_volatility(self) -> float:
+        """Volatility of the underlying window, recomputed only after it has changed"""
+        if self._vol_cache[0] != self._vol_tick_id:
+            self._vol_cache = (self._vol_tick_id, self._calculate_volatility(self.price_history[self.underlying]))
+        return self._vol_cache[1]
     
     def _get_strike_increment(self) -> float:
         """Get strike increment based on underlying"""
@@ -67,36 +81,28 @@ class OptionsStrangleStrategy(BaseStrategy):
     
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         signals: List[Signal] = []
+        _Signal = Signal
         
         for tick in ticks:
             symbol = tick.get("_symbol", "")
-            price = tick.get("last_price") or tick.get("last_traded_price") or tick.get("ltp")
+            price = tick.get("_px")
             
             if not symbol or price is None:
                 continue
-                
-            price = float(price)
             
             # Track underlying price
             if symbol == self.underlying:
                 self.last_underlying_price = price
                 self.price_history[symbol].append(price)
-                # Keep only last 50 prices for volatility calculation
-                if len(self.price_history[symbol]) > 50:
-                    self.price_history[symbol] = self.price_history[symbol][-50:]
+                self._vol_tick_id += 1
             
-            # Check if this is an options symbol we're tracking
-            if symbol not in self.symbols:
-                continue
-                
-            # Update price history for options
-            self.price_history[symbol].append(price)
-            if len(self.price_history[symbol]) > 20:
-                self.price_history[symbol] = self.price_history[symbol][-20:]
+            # Update price history for options symbols we're tracking (O(1) index lookup)
+            elif symbol in self._idx:
+                self.price_history[symbol].append(price)
         
         # Generate strangle signals based on underlying volatility
         if self.last_underlying_price and self.underlying in self.price_history:
-            underlying_vol = self._calculate_volatility(self.price_history[self.underlying])
+            underlying_vol = self._underlying_volatility()
             
             if underlying_vol > self.volatility_threshold:
                 ce_strike, pe_strike = self._get_otm_strikes(self.last_underlying_price)
@@ -109,8 +115,8 @@ class OptionsStrangleStrategy(BaseStrategy):
                     pe_symbol = f"{self.underlying}{self.expiry}{pe_strike}PE"
                     
                     # Buy both CE and PE
-                    signals.append(Signal(symbol=ce_symbol, side="BUY", quantity=self.quantity))
-                    signals.append(Signal(symbol=pe_symbol, side="BUY", quantity=self.quantity))
+                    signals.append(_Signal(ce_symbol, "BUY", self.quantity))
+                    signals.append(_Signal(pe_symbol, "BUY", self.quantity))
                     
                     # Mark position as opened
                     self.positions[strangle_key] = {
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import collections
-from typing import Deque, Dict, Iterable, List
+import math
+from typing import Iterable, List
 
-from .base import BaseStrategy, Signal
+import numpy as np
+
+from .base import BaseStrategy, PriceBook, Signal
 
 
 class OptionsTouchSmaStrategy(BaseStrategy):
@@ -14,48 +16,75 @@ class OptionsTouchSmaStrategy(BaseStrategy):
     The execution layer (server) handles placing CE/PE based on these signals.
     """
 
+    # Recompute the running sum from the window this often to shed float drift
+    RESYNC_EVERY = 1000
+    # Relative band around the touch bounds inside which the running SMA is not trusted
+    TOUCH_TOL = 1e-9
+
     def __init__(self, symbols: Iterable[str], length: int = 21, offset: int = 0, quantity: int = 1) -> None:
         super().__init__(symbols)
         self.length = length
         self.offset = max(0, int(offset))
         self.quantity = max(1, int(quantity))
-        self.price_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=length) for s in self.symbols
-        }
-        self.prev_close: Dict[str, float] = {s: 0.0 for s in self.symbols}
-        self.last_side: Dict[str, str] = {s: "" for s in self.symbols}
-
-    def _sma(self, values: Deque[float]) -> float:
-        if len(values) < self.length:
+        n = len(self.symbols)
+        self._book = PriceBook(n, length)
+        self._prev_close = np.zeros(n, dtype=np.float64)
+        self._last_side = np.zeros(n, dtype=np.int8)  # 1 BUY, -1 SELL, 0 none
+        # Running sum over the window, so the SMA is O(1) per tick
+        self._sum = np.zeros(n, dtype=np.float64)
+        self._evictions = np.zeros(n, dtype=np.int64)
+
+    def _push_price(self, i: int, price: float) -> None:
+        """Append to the window and keep the running sum in step."""
+        old = self._book.append(i, price)
+        if old is not None:
+            self._sum[i] -= old
+            self._evictions[i] += 1
+        if self._evictions[i] >= self.RESYNC_EVERY:
+            self._evictions[i] = 0
+            self._sum[i] = math.fsum(self._book.values(i).tolist())
+        else:
+            self._sum[i] += price
+
+    def _sma(self, i: int) -> float:
+        if self._book.count[i] < self.length:
             return float("nan")
-        slice_vals = list(values)[-self.length:]
-        return sum(slice_vals) / float(self.length)
+        return float(self._sum[i]) / self.length
+
+    def _exact_sma(self, i: int) -> float:
+        """SMA summed oldest-first from the window, free of the running sum's drift."""
+        return sum(self._book.values(i).tolist()) / self.length
 
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         signals: List[Signal] = []
+        _Signal = Signal
         for t in ticks:
             symbol = t.get("_symbol")
-            last_price = t.get("last_price") or t.get("last_traded_price") or t.get("ltp")
-            if not symbol or last_price is None:
+            last_price = t.get("_px")
+            i = self._idx.get(symbol)
+            if i is None or last_price is None:
                 continue
-            last_price = float(last_price)
-            dq = self.price_history[symbol]
-            dq.append(last_price)
-            sma = self._sma(dq)
+            self._push_price(i, last_price)
+            sma = self._sma(i)
             if not (sma == sma):
                 continue
-            prev_c = self.prev_close.get(symbol, last_price)
+            prev_c = float(self._prev_close[i])
             candle_green = last_price >= prev_c
-            side: str | None = None
+            # The running sum carries rounding from past prices; settle near-touches exactly
+            lo, hi = (prev_c, last_price) if candle_green else (last_price, prev_c)
+            tol = self.TOUCH_TOL * abs(sma)
+            if lo - tol <= sma <= hi + tol:
+                sma = self._exact_sma(i)
+            code = 0
             # Touch logic
             if candle_green and prev_c <= sma <= last_price:
-                side = "BUY"
+                code = 1
             elif (not candle_green) and prev_c >= sma >= last_price:
-                side = "SELL"
-            self.prev_close[symbol] = last_price
-            if side and side != self.last_side[symbol]:
-                signals.append(Signal(symbol=symbol, side=side, quantity=1))
-                self.last_side[symbol] = side
+                code = -1
+            self._prev_close[i] = last_price
+            if code and code != self._last_side[i]:
+                signals.append(_Signal(symbol, "BUY" if code > 0 else "SELL", 1))
+                self._last_side[i] = code
         return signals
 
 
@@ -1,109 +1,136 @@
 from __future__ import annotations
 
 import collections
-from typing import Deque, Dict, Iterable, List, Tuple
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import DefaultDict, Iterable, List, Tuple
 
-from .base import BaseStrategy, Signal
+import numpy as np
+
+from .base import BaseStrategy, PriceBook, Signal
+
+
+def _tick_time(tick: dict) -> float:
+    """Epoch seconds of a tick: exchange time in full mode, else arrival time."""
+    ts = tick.get("exchange_timestamp") or tick.get("last_trade_time")
+    if ts is None:
+        return time.time()
+    if isinstance(ts, datetime):
+        return ts.timestamp()
+    return float(ts)
 
 
 class SupportResistanceStrategy(BaseStrategy):
     """
     Support and Resistance breakout strategy
     Buy when price breaks above resistance, Sell when price breaks below support
+    
+    Pivots are found over bars of ``bar_seconds``: ticks only extend the open
+    bar, and a bar enters the history when the first tick of the next one
+    arrives. ``bar_seconds`` <= 0 treats every tick as its own bar.
     """
     
     def __init__(self, symbols: Iterable[str], lookback_period: int = 50, 
-                 breakout_threshold: float = 0.01, quantity: int = 1) -> None:
+                 breakout_threshold: float = 0.01, quantity: int = 1,
+                 bar_seconds: float = 60.0) -> None:
         super().__init__(symbols)
         self.lookback_period = lookback_period
         self.breakout_threshold = breakout_threshold  # 1% breakout threshold
         self.quantity = quantity
-        self.price_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=lookback_period) for s in self.symbols
-        }
-        self.high_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=lookback_period) for s in self.symbols
-        }
-        self.low_history: Dict[str, Deque[float]] = {
-            s: collections.deque(maxlen=lookback_period) for s in self.symbols
-        }
-        self.last_signal_side: Dict[str, str] = {s: "" for s in self.symbols}
-        self.support_levels: Dict[str, List[float]] = {s: [] for s in self.symbols}
-        self.resistance_levels: Dict[str, List[float]] = {s: [] for s in self.symbols}
+        self.bar_seconds = bar_seconds
+        n = len(self.symbols)
+        self._book = PriceBook(n, lookback_period, width=2)  # (high, low) per completed bar
+        # Open bar per symbol: bar number (-1 before the first tick), high and low so far
+        self._bar_id = np.full(n, -1, dtype=np.int64)
+        self._bar_high = np.zeros(n, dtype=np.float64)
+        self._bar_low = np.zeros(n, dtype=np.float64)
+        self._last_side = np.zeros(n, dtype=np.int8)  # 1 BUY, -1 SELL, 0 none
+        # Last computed levels per symbol, valid while _levels_version matches _version
+        self.support_levels: DefaultDict[str, List[float]] = collections.defaultdict(list)
+        self.resistance_levels: DefaultDict[str, List[float]] = collections.defaultdict(list)
+        self._version = np.zeros(n, dtype=np.int64)  # bumped whenever the high/low window changes
+        self._levels_version = np.full(n, -1, dtype=np.int64)
         
-    def _find_support_resistance(self, symbol: str) -> Tuple[List[float], List[float]]:
-        """Find support and resistance levels using pivot points"""
-        if len(self.high_history[symbol]) < 10 or len(self.low_history[symbol]) < 10:
+    def _find_support_resistance(self, symbol: str, i: int) -> Tuple[List[float], List[float]]:
+        """Find support and resistance levels using pivot points, reusing them until the window changes"""
+        version = self._version[i]
+        if self._levels_version[i] == version:
+            return self.support_levels[symbol], self.resistance_levels[symbol]
+        if self._book.count[i] < 10:
             return [], []
         
-        highs = list(self.high_history[symbol])
-        lows = list(self.low_history[symbol])
+        window = self._book.values(i)
+        highs = window[:, 0]
+        lows = window[:, 1]
         
-        support_levels = []
-        resistance_levels = []
-        
-        # Find local minima (support) and maxima (resistance)
-        for i in range(2, len(highs) - 2):
-            # Check for resistance (local maximum)
-            if (highs[i] > highs[i-1] and highs[i] > highs[i-2] and 
-                highs[i] > highs[i+1] and highs[i] > highs[i+2]):
-                resistance_levels.append(highs[i])
-            
-            # Check for support (local minimum)
-            if (lows[i] < lows[i-1] and lows[i] < lows[i-2] and 
-                lows[i] < lows[i+1] and lows[i] < lows[i+2]):
-                support_levels.append(lows[i])
+        # Find local maxima (resistance) and minima (support): each inner bar against
+        # its two neighbours on either side, compared as whole shifted slices
+        h = highs[2:-2]
+        is_resistance = (h > highs[:-4]) & (h > highs[1:-3]) & (h > highs[3:-1]) & (h > highs[4:])
+        lo = lows[2:-2]
+        is_support = (lo < lows[:-4]) & (lo < lows[1:-3]) & (lo < lows[3:-1]) & (lo < lows[4:])
         
         # Remove duplicates and sort
-        support_levels = sorted(list(set(support_levels)))
-        resistance_levels = sorted(list(set(resistance_levels)))
+        support_levels = np.unique(lo[is_support]).tolist()
+        resistance_levels = np.unique(h[is_resistance]).tolist()
         
+        self.support_levels[symbol] = support_levels
+        self.resistance_levels[symbol] = resistance_levels
+        self._levels_version[i] = version
         return support_levels, resistance_levels
     
     def _get_nearest_levels(self, price: float, support_levels: List[float], 
                           resistance_levels: List[float]) -> Tuple[float, float]:
-        """Get nearest support and resistance levels to current price"""
-        nearest_support = 0.0
-        nearest_resistance = float('inf')
+        """Get nearest support and resistance levels to current price (levels are sorted)"""
+        # Nearest support below current price
+        idx = bisect_left(support_levels, price)
+        nearest_support = support_levels[idx - 1] if idx > 0 else 0.0
         
-        # Find nearest support below current price
-        for level in support_levels:
-            if level < price and level > nearest_support:
-                nearest_support = level
-        
-        # Find nearest resistance above current price
-        for level in resistance_levels:
-            if level > price and level < nearest_resistance:
-                nearest_resistance = level
+        # Nearest resistance above current price
+        idx = bisect_right(resistance_levels, price)
+        nearest_resistance = resistance_levels[idx] if idx < len(resistance_levels) else float('inf')
         
         return nearest_support, nearest_resistance
     
     def on_ticks(self, ticks: List[dict]) -> List[Signal]:
         signals: List[Signal] = []
+        _Signal = Signal
         
         for tick in ticks:
             symbol = tick.get("_symbol", "")
-            price = tick.get("last_price") or tick.get("last_traded_price") or tick.get("ltp")
+            price = tick.get("_px")
             high = tick.get("high") or price
             low = tick.get("low") or price
             
             if not symbol or price is None:
                 continue
-                
-            price = float(price)
-            high = float(high)
-            low = float(low)
             
-            if symbol not in self.price_history:
+            i = self._idx.get(symbol)
+            if i is None:
                 continue
                 
-            # Update price history
-            self.price_history[symbol].append(price)
-            self.high_history[symbol].append(high)
-            self.low_history[symbol].append(low)
+            # Update the open bar; only completed bars enter the high/low history
+            if self.bar_seconds <= 0:
+                self._book.append(i, (high, low))
+                self._version[i] += 1
+            else:
+                bar = int(_tick_time(tick) // self.bar_seconds)
+                if bar != self._bar_id[i]:
+                    if self._bar_id[i] >= 0:
+                        self._book.append(i, (self._bar_high[i], self._bar_low[i]))
+                        self._version[i] += 1
+                    self._bar_id[i] = bar
+                    self._bar_high[i] = high
+                    self._bar_low[i] = low
+                else:
+                    if high > self._bar_high[i]:
+                        self._bar_high[i] = high
+                    if low < self._bar_low[i]:
+                        self._bar_low[i] = low
             
             # Find support and resistance levels
-            support_levels, resistance_levels = self._find_support_resistance(symbol)
+            support_levels, resistance_levels = self._find_support_resistance(symbol, i)
             
             if not support_levels or not resistance_levels:
                 continue
@@ -117,21 +144,21 @@ class SupportResistanceStrategy(BaseStrategy):
             # Resistance breakout (bullish)
             if (nearest_resistance != float('inf') and 
                 price > nearest_resistance * (1 + self.breakout_threshold) and
-                self.last_signal_side[symbol] != "BUY"):
-                signals.append(Signal(symbol=symbol, side="BUY", quantity=self.quantity))
-                self.last_signal_side[symbol] = "BUY"
+                self._last_side[i] != 1):
+                signals.append(_Signal(symbol, "BUY", self.quantity))
+                self._last_side[i] = 1
             
             # Support breakdown (bearish)
             elif (nearest_support > 0 and 
                   price < nearest_support * (1 - self.breakout_threshold) and
-                  self.last_signal_side[symbol] != "SELL"):
-                signals.append(Signal(symbol=symbol, side="SELL", quantity=self.quantity))
-                self.last_signal_side[symbol] = "SELL"
+                  self._last_side[i] != -1):
+                signals.append(_Signal(symbol, "SELL", self.quantity))
+                self._last_side[i] = -1
             
             # Reset signal if price returns to range
             elif (nearest_support > 0 and nearest_resistance != float('inf') and
                   nearest_support * (1 + self.breakout_threshold) < price < 
                   nearest_resistance * (1 - self.breakout_threshold)):
-                self.last_signal_side[symbol] = ""
+                self._last_side[i] = 0
         
         return signals
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import csv
+import itertools
 import logging
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from operator import itemgetter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Instrument:
     instrument_token: int
     exchange_token: int
@@ -23,28 +31,117 @@ class Instrument:
     instrument_type: str
     segment: str
     exchange: str
+    # Upper-cased tradingsymbol, computed once per load for symbol lookups and search
+    tradingsymbol_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        upper = self.tradingsymbol.upper()
+        # Broker symbols are already upper case; share the string rather than keep a copy
+        self.tradingsymbol_upper = self.tradingsymbol if upper == self.tradingsymbol else upper
+
+
+# Column types for the Parquet instrument dump
+INSTRUMENT_SCHEMA = pa.schema([
+    ("instrument_token", pa.int64()),
+    ("exchange_token", pa.int64()),
+    ("tradingsymbol", pa.string()),
+    ("name", pa.string()),
+    ("last_price", pa.float64()),
+    ("expiry", pa.string()),
+    ("strike", pa.float64()),
+    ("tick_size", pa.float64()),
+    ("lot_size", pa.int64()),
+    ("instrument_type", pa.string()),
+    ("segment", pa.string()),
+    ("exchange", pa.string()),
+])
+
+
+# Columns read by load_symbol_index
+_SYMBOL_INDEX_SCHEMA = pa.schema([
+    ("instrument_token", pa.int64()),
+    ("tradingsymbol", pa.string()),
+    ("exchange", pa.string()),
+])
+
+
+def _instruments_table(data: List[dict]) -> pa.Table:
+    # Kite returns expiry as a date for derivatives and "" otherwise
+    expiry = [r.get("expiry") for r in data]
+    columns = {
+        "instrument_token": [int(r.get("instrument_token") or 0) for r in data],
+        "exchange_token": [int(r.get("exchange_token") or 0) for r in data],
+        "tradingsymbol": [r.get("tradingsymbol") or "" for r in data],
+        "name": [r.get("name") or "" for r in data],
+        "last_price": [float(r.get("last_price") or 0.0) for r in data],
+        "expiry": [(str(e) if e else None) for e in expiry],
+        "strike": [float(r.get("strike") or 0.0) for r in data],
+        "tick_size": [float(r.get("tick_size") or 0.05) for r in data],
+        "lot_size": [int(r.get("lot_size") or 1) for r in data],
+        "instrument_type": [r.get("instrument_type") or "" for r in data],
+        "segment": [r.get("segment") or "" for r in data],
+        "exchange": [r.get("exchange") or "" for r in data],
+    }
+    return pa.table(columns, schema=INSTRUMENT_SCHEMA)
+
+
+def _dump_instruments_csv(data: List[dict], path: str) -> None:
+    # Same header and columns as the broker CSV; empty expiry stays an empty field
+    pacsv.write_csv(_instruments_table(data), path, write_options=pacsv.WriteOptions(include_header=True))
+
+
+def write_instruments(data: List[dict], path: str) -> None:
+    """Write the broker instrument dump; Parquet when ``path`` ends in .parquet, else CSV."""
+    if not data:
+        return
+    if Path(path).suffix.lower() != ".parquet":
+        _dump_instruments_csv(data, path)
+        return
+    pq.write_table(_instruments_table(data), path, compression="zstd")
+
+
+def _load_instruments_parquet(path: str) -> List[Instrument]:
+    cols = pq.read_table(path, columns=INSTRUMENT_SCHEMA.names).to_pydict()
+    return [
+        Instrument(tok, ex_tok, sym, name or "", lp or 0.0, exp or None, strike or 0.0, tick or 0.05, lot or 1, itype or "", seg or "", exch or "")
+        for tok, ex_tok, sym, name, lp, exp, strike, tick, lot, itype, seg, exch in zip(
+            *(cols[n] for n in INSTRUMENT_SCHEMA.names)
+        )
+    ]
+
+
+def _instruments_path(csv_path: str) -> str:
+    path = Path(csv_path)
+    sibling = path.with_suffix(".csv" if path.suffix.lower() == ".parquet" else ".parquet")
+    # Prefer the CSV / Parquet dump next to the configured path when it is missing or older
+    # (e.g. after a scripts/download_instruments.py run)
+    if sibling.exists() and (not path.exists() or sibling.stat().st_mtime > path.stat().st_mtime):
+        logger.info("Loading instruments from %s (newer than %s)", sibling, path)
+        return str(sibling)
+    return csv_path
 
 
 def load_instruments(csv_path: str) -> List[Instrument]:
+    csv_path = _instruments_path(csv_path)
+    if Path(csv_path).suffix.lower() == ".parquet":
+        return _load_instruments_parquet(csv_path)
     instruments: List[Instrument] = []
     with open(csv_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return instruments
+        # Pick the Instrument columns by position; absent columns read the empty pad field
+        idx = {name: i for i, name in enumerate(header)}
+        pick = itemgetter(*(idx.get(name, len(header)) for name in INSTRUMENT_SCHEMA.names))
+        pad = [""] if any(name not in idx for name in INSTRUMENT_SCHEMA.names) else None
         for row in reader:
             try:
+                tok, ex_tok, sym, name, lp, exp, strike, tick, lot, itype, seg, exch = pick(row + pad if pad else row)
                 instruments.append(
                     Instrument(
-                        instrument_token=int(row.get("instrument_token", 0)),
-                        exchange_token=int(row.get("exchange_token", 0)),
-                        tradingsymbol=row.get("tradingsymbol", ""),
-                        name=row.get("name", ""),
-                        last_price=float(row.get("last_price", 0.0) or 0.0),
-                        expiry=row.get("expiry") or None,
-                        strike=float(row.get("strike", 0.0) or 0.0),
-                        tick_size=float(row.get("tick_size", 0.05) or 0.05),
-                        lot_size=int(row.get("lot_size", 1) or 1),
-                        instrument_type=row.get("instrument_type", ""),
-                        segment=row.get("segment", ""),
-                        exchange=row.get("exchange", ""),
+                        int(tok or 0), int(ex_tok or 0), sym, name, float(lp or 0.0), exp or None, float(strike or 0.0),
+                        float(tick or 0.05), int(lot or 1), itype, seg, exch,
                     )
                 )
             except Exception:
@@ -52,20 +149,69 @@ def load_instruments(csv_path: str) -> List[Instrument]:
     return instruments
 
 
+def build_symbol_index(instruments: Iterable[Instrument]) -> Dict[Tuple[str, str], int]:
+    """Map (EXCHANGE, TRADINGSYMBOL) to instrument token; ("", TRADINGSYMBOL) matches any exchange.
+
+    Build once per instruments load and pass to ``resolve_tokens_by_symbols``.
+    On duplicates the last instrument wins.
+    """
+    index: Dict[Tuple[str, str], int] = {}
+    for inst in instruments:
+        sym = inst.tradingsymbol_upper
+        index[(inst.exchange.upper(), sym)] = inst.instrument_token
+        index[("", sym)] = inst.instrument_token
+    return index
+
+
+def _upper_strings(column: pa.ChunkedArray) -> List[str]:
+    # Dictionary chunks are upper-cased on their dictionary, not on every row
+    out: List[str] = []
+    for chunk in column.chunks:
+        if pa.types.is_dictionary(chunk.type):
+            chunk = pa.DictionaryArray.from_arrays(chunk.indices, pc.utf8_upper(chunk.dictionary))
+        else:
+            chunk = pc.utf8_upper(chunk)
+        out.extend(pc.fill_null(chunk.cast(pa.string()), "").to_pylist())
+    return out
+
+
+def load_symbol_index(csv_path: str) -> Dict[Tuple[str, str], int]:
+    """Same mapping as ``build_symbol_index``, read straight from the dump's columns.
+
+    Only the token, symbol and exchange columns are loaded and no Instrument
+    objects are built, for callers that just resolve symbols.
+    """
+    csv_path = _instruments_path(csv_path)
+    if Path(csv_path).suffix.lower() == ".parquet":
+        # Keep the repetitive exchange column dictionary-encoded so it is upper-cased once per value
+        table = pq.read_table(csv_path, columns=_SYMBOL_INDEX_SCHEMA.names, read_dictionary=["exchange"])
+    else:
+        table = pacsv.read_csv(csv_path, convert_options=pacsv.ConvertOptions(
+            include_columns=_SYMBOL_INDEX_SCHEMA.names, column_types=_SYMBOL_INDEX_SCHEMA,
+        ))
+    tokens = pc.fill_null(table.column("instrument_token"), 0).to_pylist()
+    syms = _upper_strings(table.column("tradingsymbol"))
+    exchanges = _upper_strings(table.column("exchange"))
+    index: Dict[Tuple[str, str], int] = dict(zip(zip(exchanges, syms), tokens))
+    index.update(zip(zip(itertools.repeat("", len(syms)), syms), tokens))
+    return index
+
+
 def resolve_tokens_by_symbols(
-    instruments: List[Instrument], symbols: Iterable[str], exchange: Optional[str] = None
+    index: Dict[Tuple[str, str], int], symbols: Iterable[str], exchange: Optional[str] = None
 ) -> Dict[str, int]:
-    symbol_set = {s.upper().strip() for s in symbols}
+    ex = (exchange or "").upper()
     mapping: Dict[str, int] = {}
-    for inst in instruments:
-        if exchange and inst.exchange.upper() != exchange.upper():
-            continue
-        sym = inst.tradingsymbol.upper()
-        if sym in symbol_set:
-            mapping[sym] = inst.instrument_token
-    missing = symbol_set - set(mapping.keys())
+    missing: List[str] = []
+    for s in symbols:
+        sym = s.upper().strip()
+        tok = index.get((ex, sym))
+        if tok is None:
+            missing.append(sym)
+        else:
+            mapping[sym] = tok
     if missing:
-        logger.warning("Symbols not found in instruments: %s", sorted(missing))
+        logger.warning("Symbols not found in instruments: %s", sorted(set(missing)))
     return mapping
 
 
@@ -79,7 +225,7 @@ def search_symbols(
     for inst in instruments:
         if exchange and inst.exchange.upper() != exchange.upper():
             continue
-        sym = inst.tradingsymbol.upper()
+        sym = inst.tradingsymbol_upper
         name = (inst.name or "").upper()
         if q in sym or q in name:
             results.append(inst)
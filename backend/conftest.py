@@ -0,0 +1 @@
+# Marks backend/ as the pytest root so tests import the app package as "app"
@@ -5,14 +5,13 @@ import logging
 import signal
 import sys
 import threading
-import time
 from typing import Dict, List
 
 from app.config import get_config
 from app.logging_setup import setup_logging
 from app.broker.zerodha_client import ZerodhaClient
 from app.market.ticker import MarketTicker
-from app.utils.symbols import load_instruments, resolve_tokens_by_symbols
+from app.utils.symbols import load_symbol_index, resolve_tokens_by_symbols
 from app.strategies.sma_crossover import SmaCrossoverStrategy
 
 
@@ -43,8 +42,9 @@ def main() -> int:
         logger.error("ACCESS_TOKEN missing. Run scripts/get_access_token.py first.")
         return 1
 
-    instruments = load_instruments(cfg.instruments_csv_path)
-    symbol_to_token = resolve_tokens_by_symbols(instruments, args.symbols, exchange=args.exchange)
+    # Only symbol resolution is needed here, so skip building Instrument objects
+    symbol_index = load_symbol_index(cfg.instruments_csv_path)
+    symbol_to_token = resolve_tokens_by_symbols(symbol_index, args.symbols, exchange=args.exchange)
     if not symbol_to_token:
         logger.error("No tokens resolved for symbols: %s", args.symbols)
         return 2
@@ -59,27 +59,31 @@ def main() -> int:
 
     shutdown = threading.Event()
 
+    buy_txn = broker.kite.TRANSACTION_TYPE_BUY
+    sell_txn = broker.kite.TRANSACTION_TYPE_SELL
+    t2s = token_to_symbol.get
+
     def on_tick(ticks: List[dict]) -> None:
-        for t in ticks:
-            tok = t.get("instrument_token")
-            if tok in token_to_symbol:
-                t["_symbol"] = token_to_symbol[tok]
-        signals = strategy.on_ticks(ticks)
+        # Resolve symbols and hand the batch to the strategy as (row, price) arrays
+        rows, prices = strategy.batch_arrays(
+            [t2s(t.get("instrument_token")) for t in ticks], [t.get("_px") for t in ticks]
+        )
+        signals = strategy.on_batch(rows, prices)
+        orders: List[dict] = []
         for sig in signals:
             side = sig.side
             if cfg.dry_run:
                 logger.info("[DRY] %s %s qty=%s", side, sig.symbol, sig.quantity)
                 continue
-            try:
-                txn_type = broker.kite.TRANSACTION_TYPE_BUY if side == "BUY" else broker.kite.TRANSACTION_TYPE_SELL
-                broker.place_market_order(
-                    tradingsymbol=sig.symbol,
-                    exchange=args.exchange,
-                    quantity=sig.quantity,
-                    transaction_type=txn_type,
-                )
-            except Exception:
-                logger.exception("Order placement failed for %s", sig.symbol)
+            orders.append({
+                "tradingsymbol": sig.symbol,
+                "exchange": args.exchange,
+                "quantity": sig.quantity,
+                "transaction_type": buy_txn if side == "BUY" else sell_txn,
+            })
+        if orders:
+            # Signals crossing together go out concurrently rather than one round trip at a time
+            broker.place_orders_basket(orders)
 
     def on_connect():
         logger.info("Ticker connected")
@@ -107,8 +111,8 @@ def main() -> int:
     signal.signal(signal.SIGINT, handle_sigint)
     signal.signal(signal.SIGTERM, handle_sigint)
 
-    while not shutdown.is_set():
-        time.sleep(1.0)
+    # Block until a signal or the ticker closing sets the event, instead of polling it
+    shutdown.wait()
     ticker.stop()
     return 0
 
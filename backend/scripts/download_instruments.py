@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import csv
+import sys
 from pathlib import Path
 
 from dotenv import dotenv_values
 from kiteconnect import KiteConnect
 
+# Run as a plain script: make the backend package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.symbols import write_instruments  # noqa: E402
+
 
 def main() -> int:
     env = dotenv_values(".env")
@@ -25,11 +30,11 @@ def main() -> int:
         print("No instruments returned; check token.")
         return 2
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
-    print(f"Wrote {len(data)} instruments to {out_path}")
+    # CSV for inspection plus a Parquet copy that loads without text parsing;
+    # load_instruments picks whichever of the two is newer
+    for path in (out_path.with_suffix(".csv"), out_path.with_suffix(".parquet")):
+        write_instruments(data, str(path))
+        print(f"Wrote {len(data)} instruments to {path}")
     return 0
 
 
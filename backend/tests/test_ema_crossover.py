@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.strategies._ema_kernel import ema_path
+from app.strategies.ema_crossover import EmaCrossoverStrategy
+
+
+def _sides(strategy, prices, batch=1):
+    out = []
+    for j in range(0, len(prices), batch):
+        ticks = [{"_symbol": "X", "_px": p} for p in prices[j:j + batch]]
+        out.extend(s.side for s in strategy.on_ticks(ticks))
+    return out
+
+
+def _reference_sides(prices, short_window, long_window):
+    # Plain per-tick recurrence, as the strategy computed it before vectorizing
+    k_s = 2.0 / (short_window + 1.0)
+    k_l = 2.0 / (long_window + 1.0)
+    es = el = prices[0]
+    last = ""
+    out = []
+    for p in prices[1:]:
+        es = (p - es) * k_s + es
+        el = (p - el) * k_l + el
+        side = "BUY" if es > el else "SELL"
+        if side != last:
+            out.append(side)
+            last = side
+    return out
+
+
+def test_ema_path_flat_series_stays_on_price():
+    out = ema_path(100.0, np.full(64, 100.0), 2.0 / 6.0)
+    assert (out == 100.0).all()
+
+
+def test_flat_ticks_emit_single_sell():
+    for batch in (1, 4):
+        assert _sides(EmaCrossoverStrategy(["X"], 5, 12), [100.0] * 4, batch) == ["SELL"]
+
+
+def test_near_flat_walk_matches_reference():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        steps = rng.choice([0.0, 0.0, 0.0, 0.05, -0.05], size=300)
+        prices = np.round(100.0 + np.cumsum(steps), 2).tolist()
+        expected = _reference_sides(prices, 5, 12)
+        for batch in (1, 7):
+            assert _sides(EmaCrossoverStrategy(["X"], 5, 12), prices, batch) == expected
@@ -3,6 +3,7 @@ export const dynamic = "force-dynamic";
 
 import { useEffect, useMemo, useRef, useState } from "react";
 import CandleChart from "../components/CandleChart";
+import { decodeTicks } from "../../lib/ticks";
 
 type Tick = { instrument_token: number; last_price?: number; last_traded_price?: number; ltp?: number; symbol?: string; };
 const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:10000";
@@ -23,7 +24,8 @@ export default function MarketData() {
     ws.onmessage = (evt) => {
       try {
         const data = JSON.parse(evt.data);
-        if (Array.isArray(data.ticks)) setTicks(data.ticks);
+        const list = decodeTicks(data);
+        if (Array.isArray(list)) setTicks(list);
       } catch {}
     };
     ws.onclose = () => (wsRef.current = null);
@@ -6,6 +6,7 @@ import AuthStatus from "./components/AuthStatus";
 import AlertSound from "./components/AlertSound";
 import CandleChart from "./components/CandleChart";
 import IndexMini from "./components/IndexMini";
+import { decodeTicks } from "../lib/ticks";
 
 type Tick = {
   instrument_token: number;
@@ -87,9 +88,10 @@ export default function Home() {
     ws.onmessage = (evt) => {
       try {
         const data = JSON.parse(evt.data);
-        if (Array.isArray(data.ticks)) {
+        const list = decodeTicks(data);
+        if (Array.isArray(list)) {
           const ts = Date.now();
-          setTicks(data.ticks.map((t: any) => ({ ...t, updated_at: ts })));
+          setTicks(list.map((t: any) => ({ ...t, updated_at: ts })));
         }
       } catch {}
     };
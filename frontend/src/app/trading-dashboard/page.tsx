@@ -2,6 +2,7 @@
 
 import { useEffect, useState, useRef } from "react";
 import dynamic from "next/dynamic";
+import { decodeTicks } from "../../lib/ticks";
 // Lazy-load CandleChart to isolate any rendering issues
 const CandleChart = dynamic(() => import("../components/CandleChart"), { ssr: false });
 
@@ -77,9 +78,10 @@ export default function TradingDashboard() {
       ws.onmessage = (evt) => {
         try {
           const data = JSON.parse(evt.data);
-          if (Array.isArray(data.ticks)) {
+          const list = decodeTicks(data);
+          if (Array.isArray(list)) {
             const ts = Date.now();
-            setTicks(data.ticks.map((t: any) => ({ ...t, updated_at: ts })));
+            setTicks(list.map((t: any) => ({ ...t, updated_at: ts })));
           }
         } catch {}
       };
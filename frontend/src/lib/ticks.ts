@@ -0,0 +1,10 @@
+// Decode a /ws/ticks frame into tick objects.
+// The backend sends columnar frames {cols, rows} (field names once per frame);
+// a legacy {ticks: [...]} frame is passed through unchanged.
+export function decodeTicks(data: any): any[] | undefined {
+  if (Array.isArray(data?.rows)) {
+    const cols: string[] = data.cols;
+    return data.rows.map((r: any[]) => Object.fromEntries(cols.map((c, i) => [c, r[i]])));
+  }
+  return data?.ticks;
+}